@@ -4,18 +4,71 @@ author: Marc Plogas
 funding_url: https://github.com/mplogas/open-webui
 version: 1.0.0
 license: MIT
+requirements: aiohttp
 """
 
+import aiohttp
+import asyncio
 import json
 import os
-import requests
-import unittest
+import time
+from collections import deque
 from datetime import datetime
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from typing import Callable, Any, Optional, Dict
+from typing import Callable, Any, Optional, Dict, List, Tuple
 
-load_dotenv()
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_CACHE_MAX_ENTRIES = 1024
+_MAX_RETRIES = 3
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+_NOTICE_KEYS = ("Note", "Information", "Error Message")
+
+
+def _is_api_notice(payload: str) -> bool:
+    # Rate-limit and error notices come back as small single-key objects
+    if len(payload) > 1024:
+        return False
+    try:
+        data = _json_loads(payload)
+    except ValueError:
+        return True
+    return isinstance(data, dict) and any(key in data for key in _NOTICE_KEYS)
+
+
+class RateLimiter:
+    """Allow at most max_rate requests per time_period seconds."""
+
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._sent: deque = deque()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        if self.max_rate <= 0:
+            return self
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.time_period:
+                    self._sent.popleft()
+                if len(self._sent) < self.max_rate:
+                    self._sent.append(now)
+                    return self
+                await asyncio.sleep(self.time_period - (now - self._sent[0]))
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+# Shared by every Tools instance since the quota is per API key, not per chat
+_RATE_LIMITER = RateLimiter(max_rate=5, time_period=60.0)
 
 
 class EventEmitter:
@@ -59,9 +112,63 @@ class Tools:
         ALPHAVANTAGE_API_KEY: str = Field(
             default="", description="The API key to access Alpha Vantage"
         )
+        CACHE_TTL_SECONDS: int = Field(
+            default=300,
+            description="How long to cache daily series and symbol searches (0 disables)",
+        )
+        QUOTE_CACHE_TTL_SECONDS: int = Field(
+            default=5,
+            description="How long to cache quotes and intraday series (0 disables)",
+        )
+        RATE_LIMIT_PER_MINUTE: int = Field(
+            default=5,
+            description="Max API requests per minute (free tier: 5, 0 disables)",
+        )
 
     def __init__(self):
         self.valves = self.Valves()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cache: Dict[tuple, Tuple[float, str]] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _fetch(self, params: Dict[str, str], ttl: int) -> str:
+        key = tuple(sorted(item for item in params.items() if item[0] != "apikey"))
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Alpha Vantage already returns JSON, so pass the body through as-is
+        session = self._get_session()
+        _RATE_LIMITER.max_rate = self.valves.RATE_LIMIT_PER_MINUTE
+        for attempt in range(_MAX_RETRIES + 1):
+            async with _RATE_LIMITER, session.get(
+                self.valves.ALPHAVANTAGE_URL, params=params
+            ) as response:
+                if response.status in _RETRY_STATUSES and attempt < _MAX_RETRIES:
+                    retry_delay = 0.3 * 2**attempt
+                else:
+                    response.raise_for_status()
+                    payload = await response.text(encoding="utf-8")
+                    break
+            await asyncio.sleep(retry_delay)
+
+        if ttl > 0 and not _is_api_notice(payload):
+            if len(self._cache) >= _CACHE_MAX_ENTRIES:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (time.monotonic() + ttl, payload)
+        return payload
 
     async def get_daily_time_series(
         self,
@@ -82,10 +189,7 @@ class Tools:
                 "symbol": symbol,
                 "apikey": self.valves.ALPHAVANTAGE_API_KEY,
             }
-            response = requests.get(self.valves.ALPHAVANTAGE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            encoded_data = json.dumps(data, ensure_ascii=False)
+            encoded_data = await self._fetch(params, self.valves.CACHE_TTL_SECONDS)
             await emitter.success_update(
                 f"Received daily time series data for {symbol}"
             )
@@ -119,10 +223,9 @@ class Tools:
                 "interval": interval,
                 "apikey": self.valves.ALPHAVANTAGE_API_KEY,
             }
-            response = requests.get(self.valves.ALPHAVANTAGE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            encoded_data = json.dumps(data, ensure_ascii=False)
+            encoded_data = await self._fetch(
+                params, self.valves.QUOTE_CACHE_TTL_SECONDS
+            )
             await emitter.success_update(
                 f"Received intraday time series data for {symbol}"
             )
@@ -151,10 +254,9 @@ class Tools:
                 "symbol": symbol,
                 "apikey": self.valves.ALPHAVANTAGE_API_KEY,
             }
-            response = requests.get(self.valves.ALPHAVANTAGE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            encoded_data = json.dumps(data, ensure_ascii=False)
+            encoded_data = await self._fetch(
+                params, self.valves.QUOTE_CACHE_TTL_SECONDS
+            )
             await emitter.success_update(f"Received global quote for {symbol}")
             return encoded_data
         except Exception as e:
@@ -162,6 +264,56 @@ class Tools:
             await emitter.error_update(error_msg)
             return error_msg
 
+    async def get_global_quotes(
+        self,
+        symbols: List[str],
+        __event_emitter__: Optional[Callable[[dict], Any]] = None,
+    ) -> str:
+        """
+        Retrieve the current global quotes for several stock symbols at once.
+
+        :param symbols: The stock ticker symbols (e.g., ['AAPL', 'MSFT']).
+        :return: A JSON array with one global quote (or error) per symbol.
+        """
+        emitter = EventEmitter(__event_emitter__)
+        try:
+            await emitter.progress_update(
+                f"Fetching global quotes for {', '.join(symbols)}"
+            )
+            # Requests overlap in flight; the shared limiter still caps the rate
+            results = await asyncio.gather(
+                *(
+                    self._fetch(
+                        {
+                            "function": "GLOBAL_QUOTE",
+                            "symbol": symbol,
+                            "apikey": self.valves.ALPHAVANTAGE_API_KEY,
+                        },
+                        self.valves.QUOTE_CACHE_TTL_SECONDS,
+                    )
+                    for symbol in symbols
+                ),
+                return_exceptions=True,
+            )
+            # Successful payloads are already JSON, so splice them in verbatim
+            entries = [
+                (
+                    json.dumps({"symbol": symbol, "Error": str(result)})
+                    if isinstance(result, Exception)
+                    else result
+                )
+                for symbol, result in zip(symbols, results)
+            ]
+            encoded_data = "[" + ",".join(entries) + "]"
+            await emitter.success_update(
+                f"Received global quotes for {len(symbols)} symbols"
+            )
+            return encoded_data
+        except Exception as e:
+            error_msg = f"Error fetching global quotes: {str(e)}"
+            await emitter.error_update(error_msg)
+            return error_msg
+
     async def search_symbol(
         self,
         keywords: str,
@@ -181,10 +333,7 @@ class Tools:
                 "keywords": keywords,
                 "apikey": self.valves.ALPHAVANTAGE_API_KEY,
             }
-            response = requests.get(self.valves.ALPHAVANTAGE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            encoded_data = json.dumps(data, ensure_ascii=False)
+            encoded_data = await self._fetch(params, self.valves.CACHE_TTL_SECONDS)
             await emitter.success_update(f"Search completed for keyword '{keywords}'")
             return encoded_data
         except Exception as e:
@@ -193,31 +342,46 @@ class Tools:
             return error_msg
 
 
-# Example asynchronous test cases using unittest
-class AlphaVantageToolTest(unittest.IsolatedAsyncioTestCase):
-    async def test_get_daily_time_series(self):
-        tool = Tools()
-        result = await tool.get_daily_time_series("AAPL")
-        data = json.loads(result)
-        # Alpha Vantage returns a dictionary with "Time Series (Daily)"
-        self.assertTrue("Time Series (Daily)" in data or "Error" in result)
+if __name__ == "__main__":
+    # Only the test run needs these, so production imports skip them
+    import unittest
 
-    async def test_get_intraday_series(self):
-        tool = Tools()
-        result = await tool.get_intraday_series("AAPL", interval="15min")
-        data = json.loads(result)
-        # Check that we received intraday data or an error message
-        self.assertTrue("Time Series (15min)" in data or "Error" in result)
+    from dotenv import load_dotenv
 
-    async def test_get_global_quote(self):
-        tool = Tools()
-        result = await tool.get_global_quote("AAPL")
-        data = json.loads(result)
-        # Check that we received global quote data or an error message
-        self.assertTrue("Global Quote" in data or "Error" in result)
+    load_dotenv()
 
+    # Example asynchronous test cases using unittest
+    class AlphaVantageToolTest(unittest.IsolatedAsyncioTestCase):
+        async def asyncSetUp(self):
+            self.tool = Tools()
+
+        async def asyncTearDown(self):
+            await self.tool.aclose()
+
+        async def test_get_daily_time_series(self):
+            result = await self.tool.get_daily_time_series("AAPL")
+            data = _json_loads(result)
+            # Alpha Vantage returns a dictionary with "Time Series (Daily)"
+            self.assertTrue("Time Series (Daily)" in data or "Error" in result)
+
+        async def test_get_intraday_series(self):
+            result = await self.tool.get_intraday_series("AAPL", interval="15min")
+            data = _json_loads(result)
+            # Check that we received intraday data or an error message
+            self.assertTrue("Time Series (15min)" in data or "Error" in result)
+
+        async def test_get_global_quote(self):
+            result = await self.tool.get_global_quote("AAPL")
+            data = _json_loads(result)
+            # Check that we received global quote data or an error message
+            self.assertTrue("Global Quote" in data or "Error" in result)
+
+        async def test_get_global_quotes(self):
+            result = await self.tool.get_global_quotes(["AAPL", "MSFT"])
+            data = _json_loads(result)
+            # One entry per symbol, each a quote or an error message
+            self.assertEqual(len(data), 2)
 
-if __name__ == "__main__":
     print("Running tests...")
     unittest.main()
 
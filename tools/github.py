@@ -10,13 +10,88 @@ required_open_webui_version: 0.4.0
 
 """
 
+import asyncio
+import atexit
 import base64
+import functools
+import io
+import itertools
 import json
+import posixpath
+import random
+import re
+import time
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
 import requests
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_CACHE_MAX_ENTRIES = 1024
+_LINE_START_RE = re.compile(r"^", re.MULTILINE)
+_MAX_AGE_RE = re.compile(r"(?<!s-)max-age=(\d+)")
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_BY_NAME = itemgetter("name")
+# Submodules ("commit" entries) are left out, as in the contents listing
+_TREE_TYPES = {"tree": "dir", "blob": "file"}
+_HTTP_METHODS = frozenset(("GET", "POST", "PATCH", "DELETE"))
+_STATUS_MESSAGES = {
+    401: "Authentication failed",
+    403: "Rate limit or access forbidden",
+    404: "Not found",
+}
+_PER_PAGE_MAX = 100
+_RATE_LIMIT_RETRIES = 3
+# Longer waits fail fast rather than stalling the chat
+_MAX_RATE_LIMIT_WAIT = 60
+# Stay well inside GitHub's secondary rate limit on concurrent requests
+_PAGE_CONCURRENCY = 5
+
+_LANGS: Dict[str, str] = {
+    "py": "python",
+    "js": "javascript",
+    "ts": "typescript",
+    "java": "java",
+    "c": "c",
+    "cpp": "cpp",
+    "cs": "csharp",
+    "go": "go",
+    "rs": "rust",
+    "rb": "ruby",
+    "php": "php",
+    "sh": "bash",
+    "md": "markdown",
+    "html": "html",
+    "css": "css",
+    "json": "json",
+    "yaml": "yaml",
+}
+
+
+# Statuses and conclusions come from a small fixed set, so memoise them
+@functools.lru_cache(maxsize=64)
+def _format_workflow_status(
+    status: Optional[str], conclusion: Optional[str] = None
+) -> str:
+    status_text = (status or "unknown").replace("_", " ").strip()
+    status_text = status_text.capitalize() if status_text else "Unknown"
+
+    if conclusion and conclusion not in {"", "N/A"}:
+        conclusion_text = conclusion.replace("_", " ").strip()
+        if conclusion_text:
+            status_text = f"{status_text} ({conclusion_text})"
+
+    return status_text
 
 
 class Tools:
@@ -24,6 +99,33 @@ class Tools:
         self.valves = self.Valves()
         self.citation = False
         self.base_url = "https://api.github.com"
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._etags: Dict[Tuple, Tuple[Optional[str], Optional[str], Any]] = {}
+        self._render_cache: Dict[str, Tuple[Any, Any, str]] = {}
+        self._headers: Optional[Dict[str, str]] = None
+        self._headers_token: Optional[str] = None
+        self._rate_limit_remaining: Optional[int] = None
+        self._rate_limit_reset = 0.0
+
+        # One pooled session keeps connections to api.github.com alive
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(500, 502, 503, 504),
+                # Leave every rate-limit wait (429, or 403 with Retry-After) to
+                # _send, which caps it at _MAX_RATE_LIMIT_WAIT
+                respect_retry_after_header=False,
+                # Retrying POST/PATCH could create duplicate gists or runs
+                allowed_methods=frozenset(["GET", "DELETE"]),
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+        atexit.register(self._session.close)
 
     class Valves(BaseModel):
         github_token: str = Field(
@@ -34,6 +136,9 @@ class Tools:
         enable_status_updates: bool = Field(
             default=True, description="Show status updates"
         )
+        cache_ttl_seconds: int = Field(
+            default=60, description="Cache GET responses for N seconds (0 disables)"
+        )
 
     class UserValves(BaseModel):
         show_line_numbers: bool = Field(default=True, description="Show line numbers")
@@ -41,14 +146,29 @@ class Tools:
             default=True, description="Enable syntax highlighting"
         )
 
+    async def _emit_status(
+        self, emitter, description: str, done: bool = False, hidden: bool = False
+    ) -> None:
+        if not emitter or not self.valves.enable_status_updates:
+            return
+        data: Dict[str, Any] = {"description": description, "done": done}
+        if hidden:
+            data["hidden"] = True
+        await emitter({"type": "status", "data": data})
+
     def _get_headers(self) -> Dict[str, str]:
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
-        if self.valves.github_token:
-            headers["Authorization"] = f"Bearer {self.valves.github_token}"
-        return headers
+        # Shared between requests; callers must copy before modifying it
+        token = self.valves.github_token
+        if self._headers is None or self._headers_token != token:
+            headers = {
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            }
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+            self._headers = headers
+            self._headers_token = token
+        return self._headers
 
     def _make_request(
         self,
@@ -56,89 +176,254 @@ class Tools:
         params: Optional[Dict] = None,
         method: str = "GET",
         data: Optional[Dict] = None,
+        expect_empty: bool = False,
     ) -> Any:
         url = f"{self.base_url}{endpoint}"
+        cache_key = None
+        if method == "GET":
+            cache_key = (endpoint, tuple(sorted((params or {}).items())))
+            if self.valves.cache_ttl_seconds > 0:
+                cached = self._cache.get(cache_key)
+                if cached and cached[0] > time.monotonic():
+                    return cached[1]
+        else:
+            # Writes can change anything we have cached
+            self._cache.clear()
+
         try:
-            if method == "GET":
-                response = requests.get(
-                    url, headers=self._get_headers(), params=params, timeout=30
-                )
-            elif method == "POST":
-                response = requests.post(
-                    url, headers=self._get_headers(), json=data, timeout=30
-                )
-            elif method == "PATCH":
-                response = requests.patch(
-                    url, headers=self._get_headers(), json=data, timeout=30
-                )
-            elif method == "DELETE":
-                response = requests.delete(url, headers=self._get_headers(), timeout=30)
-            else:
+            if method not in _HTTP_METHODS:
                 raise Exception(f"Unsupported HTTP method: {method}")
 
+            headers = self._get_headers()
+            validator = self._etags.get(cache_key) if cache_key else None
+            if validator:
+                # A 304 is cheap and does not count against the rate limit
+                etag, last_modified, _ = validator
+                headers = dict(headers)
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+            response = self._send(
+                method, url, headers=headers, params=params, json=data
+            )
+            if response.status_code == 304 and validator:
+                self._remember(cache_key, validator[2], self._max_age(response))
+                return validator[2]
+
             response.raise_for_status()
             if method == "DELETE":
                 return {"status": "deleted"}
-            return response.json()
+            if expect_empty or response.status_code == 204:
+                # Dispatch and cancel answer 204/202 with nothing worth parsing
+                return None
+            result = _json_loads(response.content)
+            if cache_key is not None:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    self._store(self._etags, cache_key, (etag, last_modified, result))
+                self._remember(cache_key, result, self._max_age(response))
+            return result
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                raise Exception("Authentication failed")
-            elif e.response.status_code == 404:
-                raise Exception("Not found")
-            elif e.response.status_code == 403:
-                raise Exception("Rate limit or access forbidden")
+            raise self._api_error(e.response.status_code) from e
+        except Exception as e:
+            raise Exception(f"Request failed: {str(e)}")
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request, pacing it against GitHub's rate limits.
+
+        Waits out an exhausted quota or a Retry-After hint when that takes
+        no longer than _MAX_RATE_LIMIT_WAIT, backing off exponentially with
+        jitter otherwise. The last rate-limited response is returned as-is.
+        """
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            if self._rate_limit_remaining == 0:
+                wait = self._rate_limit_reset - time.time()
+                if wait > _MAX_RATE_LIMIT_WAIT:
+                    raise Exception(f"Rate limit exceeded, resets in {int(wait)}s")
+                if wait > 0:
+                    time.sleep(wait)
+
+            response = self._session.request(method, url, timeout=30, **kwargs)
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is not None and remaining.isdigit():
+                self._rate_limit_remaining = int(remaining)
+                reset = response.headers.get("X-RateLimit-Reset", "")
+                self._rate_limit_reset = float(reset) if reset.isdigit() else 0.0
+
+            retry_after = response.headers.get("Retry-After", "")
+            rate_limited = response.status_code == 429 or (
+                response.status_code == 403 and (retry_after or remaining == "0")
+            )
+            if not rate_limited or attempt == _RATE_LIMIT_RETRIES:
+                return response
+
+            if retry_after.isdigit():
+                delay = float(retry_after)
+            elif remaining == "0":
+                delay = self._rate_limit_reset - time.time()
             else:
-                raise Exception(f"API error: {e.response.status_code}")
+                delay = min(_MAX_RATE_LIMIT_WAIT, 2**attempt + random.random())
+            if delay > _MAX_RATE_LIMIT_WAIT:
+                return response
+            response.close()
+            time.sleep(max(delay, 0))
+
+    def _make_raw_request(
+        self, endpoint: str, params: Optional[Dict] = None, max_bytes: int = 0
+    ) -> Tuple[bytes, bool]:
+        """Fetch file contents with the raw media type, skipping base64.
+
+        Returns the body and whether GitHub answered with JSON metadata
+        instead (directories, submodules). A raw body is read at most up to
+        max_bytes + 1 so oversized files are not downloaded in full.
+        """
+        url = f"{self.base_url}{endpoint}"
+        cache_key = None
+        if self.valves.cache_ttl_seconds > 0:
+            cache_key = ("raw", endpoint, tuple(sorted((params or {}).items())))
+            cached = self._cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+        headers = {**self._get_headers(), "Accept": "application/vnd.github.raw+json"}
+        try:
+            with self._send(
+                "GET", url, headers=headers, params=params, stream=True
+            ) as response:
+                response.raise_for_status()
+                is_json = response.headers.get("Content-Type", "").startswith(
+                    "application/json"
+                )
+                body = bytearray()
+                cut_off = False
+                for chunk in response.iter_content(chunk_size=65536):
+                    body += chunk
+                    if not is_json and max_bytes and len(body) > max_bytes:
+                        cut_off = True
+                        break
+        except requests.exceptions.HTTPError as e:
+            raise self._api_error(e.response.status_code) from e
         except Exception as e:
             raise Exception(f"Request failed: {str(e)}")
 
-    def _detect_language(self, ext: str) -> str:
-        langs = {
-            "py": "python",
-            "js": "javascript",
-            "ts": "typescript",
-            "java": "java",
-            "c": "c",
-            "cpp": "cpp",
-            "cs": "csharp",
-            "go": "go",
-            "rs": "rust",
-            "rb": "ruby",
-            "php": "php",
-            "sh": "bash",
-            "md": "markdown",
-            "html": "html",
-            "css": "css",
-            "json": "json",
-            "yaml": "yaml",
-        }
-        return langs.get(ext.lower(), "")
+        result = (bytes(body), is_json)
+        # A cut-off body would pass for the whole file under a raised limit
+        if cache_key is not None and not cut_off:
+            self._remember(cache_key, result, self._max_age(response))
+        return result
+
+    @staticmethod
+    def _max_age(response: requests.Response) -> Optional[int]:
+        cache_control = response.headers.get("Cache-Control", "")
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0
+        match = _MAX_AGE_RE.search(cache_control)
+        return int(match.group(1)) if match else None
+
+    async def _get_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        limit: int,
+        key: Optional[str] = None,
+    ) -> List[Any]:
+        """Collect up to limit items from a paginated list endpoint.
+
+        The first page is fetched on its own so small results cost one call;
+        any further pages are requested concurrently. key names the list
+        inside each page for endpoints that wrap it in an object.
+        """
+        per_page = min(max(limit, 1), _PER_PAGE_MAX)
+        first = await asyncio.to_thread(
+            self._make_request, endpoint, {**params, "per_page": per_page}
+        )
+        items = list(first.get(key, []) if key else first)
+        if len(items) < per_page or len(items) >= limit:
+            return items[:limit]
+
+        pages = -(-limit // per_page)
+        if key and "total_count" in first:
+            pages = min(pages, -(-first["total_count"] // per_page))
+        semaphore = asyncio.Semaphore(_PAGE_CONCURRENCY)
+
+        async def fetch(page: int) -> Any:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._make_request,
+                    endpoint,
+                    {**params, "per_page": per_page, "page": page},
+                )
+
+        for result in await asyncio.gather(*(fetch(p) for p in range(2, pages + 1))):
+            items.extend(result.get(key, []) if key else result)
+        return items[:limit]
+
+    def _remember(self, key: Tuple, result: Any, max_age: Optional[int] = None) -> None:
+        # Never keep a response longer than GitHub says it stays fresh
+        ttl = self.valves.cache_ttl_seconds
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        if ttl > 0:
+            self._store(self._cache, key, (time.monotonic() + ttl, result))
+
+    @staticmethod
+    def _store(cache: Dict[Any, Any], key: Any, value: Any) -> None:
+        if key not in cache and len(cache) >= _CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+
+    def _api_error(self, status_code: int) -> Exception:
+        message = _STATUS_MESSAGES.get(status_code)
+        return Exception(message or f"API error: {status_code}")
+
+    @staticmethod
+    def _detect_language(ext: str) -> str:
+        # Most extensions are already lowercase; skip the copy for those
+        if ext.isascii() and ext.islower():
+            return _LANGS.get(ext, "")
+        return _LANGS.get(ext.lower(), "")
 
     def _format_size(self, size: int) -> str:
-        for unit in ["B", "KB", "MB", "GB"]:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+        # Every unit is 10 more bits, so the bit length picks it directly
+        idx = min((max(size, 1).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size / (1 << (10 * idx)):.1f} {_SIZE_UNITS[idx]}"
 
     def _split_repo(self, repo: str) -> Optional[Tuple[str, str]]:
+        owner, sep, repo_name = repo.partition("/")
+        if sep and "/" not in repo_name:
+            owner, repo_name = owner.strip(), repo_name.strip()
+            return (owner, repo_name) if owner and repo_name else None
+
+        # Stray slashes ("owner/repo/", "/owner//repo") are still accepted
         parts = [part.strip() for part in repo.split("/") if part.strip()]
         if len(parts) != 2:
             return None
         return parts[0], parts[1]
 
-    def _format_workflow_status(
-        self, status: Optional[str], conclusion: Optional[str] = None
-    ) -> str:
-        status_text = (status or "unknown").replace("_", " ").strip()
-        status_text = status_text.capitalize() if status_text else "Unknown"
-
-        if conclusion and conclusion not in {"", "N/A"}:
-            conclusion_text = conclusion.replace("_", " ").strip()
-            if conclusion_text:
-                status_text = f"{status_text} ({conclusion_text})"
+    @staticmethod
+    def _tree_to_contents(entries: List[Dict], path: str) -> Dict[str, List[Dict]]:
+        # Reshape recursive tree entries under path like contents API items,
+        # grouped by parent directory relative to path ("" for path itself)
+        prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+        groups: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            entry_path = entry.get("path", "")
+            if not entry_path.startswith(prefix):
+                continue
+            item_type = _TREE_TYPES.get(entry.get("type"))
+            if item_type:
+                parent, name = posixpath.split(entry_path[len(prefix) :])
+                groups.setdefault(parent, []).append(
+                    {"name": name, "type": item_type, "size": entry.get("size", 0)}
+                )
+        return groups
 
-        return status_text
+    @staticmethod
+    def _contents_endpoint(owner: str, repo_name: str, path: str) -> str:
+        # quote("") is "", so the repository root needs no special case
+        return f"/repos/{owner}/{repo_name}/contents/{quote(path, safe='/')}"
 
     def _parse_workflow_inputs(self, inputs: Optional[str]) -> Dict[str, str]:
         if not inputs:
@@ -150,7 +435,7 @@ class Tools:
 
         if inputs.startswith("{"):
             try:
-                parsed = json.loads(inputs)
+                parsed = _json_loads(inputs)
             except json.JSONDecodeError as exc:
                 raise ValueError(f"Invalid JSON for inputs: {exc}") from exc
             if not isinstance(parsed, dict):
@@ -158,39 +443,63 @@ class Tools:
             return {str(key): str(value) for key, value in parsed.items()}
 
         entries: Dict[str, str] = {}
-        for entry in inputs.split("|||"):
-            segment = entry.strip()
+        for segment in map(str.strip, inputs.split("|||")):
             if not segment:
                 continue
-            if "=" not in segment:
+            key, sep, value = segment.partition("=")
+            if not sep:
                 raise ValueError(f"Invalid input format segment: '{segment}'")
-            key, value = segment.split("=", 1)
             entries[key.strip()] = value.strip()
 
         return entries
 
-    def _render_code_block(
+    def _write_code_block(
         self,
+        out: io.StringIO,
         content: str,
         lang: str,
         show_line_numbers: bool,
         syntax_highlighting: bool,
-    ) -> str:
+    ) -> None:
         fence_lang = lang if syntax_highlighting and lang else ""
-        block: List[str] = [f"```{fence_lang}\n"]
+        out.write(f"```{fence_lang}\n")
 
         if show_line_numbers:
-            lines = content.split("\n")
-            width = len(str(len(lines))) or 1
-            for idx, line in enumerate(lines, 1):
-                block.append(f"{idx:>{width}} | {line}\n")
+            # Number lines in one pass without materialising a list of lines
+            width = len(str(content.count("\n") + 1))
+            counter = itertools.count(1)
+            # Build the padded prefix format once instead of per line
+            prefix = f"{{:>{width}}} | ".format
+            out.write(_LINE_START_RE.sub(lambda _: prefix(next(counter)), content))
+            out.write("\n")
         else:
-            block.append(content)
+            out.write(content)
             if not content.endswith("\n"):
-                block.append("\n")
+                out.write("\n")
 
-        block.append("```\n")
-        return "".join(block)
+        out.write("```\n")
+
+    def _write_gist_files(
+        self,
+        out: io.StringIO,
+        files: Dict[str, Dict],
+        show_line_numbers: bool,
+        syntax_highlighting: bool,
+    ) -> None:
+        for filename, file_data in files.items():
+            content = file_data.get("content", "")
+            lang = (file_data.get("language") or "").lower()
+            size = file_data.get("size", 0)
+
+            out.write(f"## File: {filename}\n\n")
+            out.write(f"**Size:** {size} bytes\n")
+            if lang:
+                out.write(f"**Language:** {lang}\n")
+            out.write("\n")
+            self._write_code_block(
+                out, content, lang, show_line_numbers, syntax_highlighting
+            )
+            out.write("\n")
 
     async def read_file(
         self,
@@ -205,13 +514,7 @@ class Tools:
         if not isinstance(user_valves, self.UserValves):
             user_valves = self.UserValves()
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": f"Reading {file_path}", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, f"Reading {file_path}")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -219,56 +522,73 @@ class Tools:
                 return "Invalid repo format. Use owner/repo"
 
             owner, repo_name = owner_repo
-            endpoint = f"/repos/{owner}/{repo_name}/contents/{quote(file_path)}"
+            endpoint = self._contents_endpoint(owner, repo_name, file_path)
             params = {"ref": branch} if branch else {}
 
-            file_data = self._make_request(endpoint, params)
+            body, is_metadata = await asyncio.to_thread(
+                self._make_raw_request, endpoint, params, self.valves.max_file_size
+            )
+
+            if is_metadata:
+                # Not a plain file; fall back to the base64 contents payload
+                file_data = _json_loads(body)
+                if not isinstance(file_data, dict) or file_data.get("type") != "file":
+                    return f"{file_path} is not a file"
 
-            if file_data.get("type") != "file":
-                return f"{file_path} is not a file"
+                file_size = file_data.get("size", 0)
+                if file_size > self.valves.max_file_size:
+                    return f"File too large: {file_size} bytes"
 
-            file_size = file_data.get("size", 0)
-            if file_size > self.valves.max_file_size:
-                return f"File too large: {file_size} bytes"
+                content_encoded = file_data.get("content", "")
+                if not content_encoded:
+                    return "File content is empty"
+
+                file_name = file_data.get("name", file_path)
+                content_bytes = base64.b64decode(content_encoded)
+            else:
+                file_size = len(body)
+                if file_size > self.valves.max_file_size:
+                    return f"File too large: over {self.valves.max_file_size} bytes"
 
-            content_encoded = file_data.get("content", "")
-            if not content_encoded:
-                return "File content is empty"
+                if not body:
+                    return "File content is empty"
 
-            content_bytes = base64.b64decode(content_encoded)
+                file_name = file_path.rpartition("/")[2] or file_path
+                content_bytes = body
 
             try:
                 content = content_bytes.decode("utf-8")
             except UnicodeDecodeError:
                 return f"Binary file ({file_size} bytes)"
 
-            ext = file_path.split(".")[-1] if "." in file_path else ""
+            ext = file_path.rpartition(".")[2] if "." in file_path else ""
             lang = self._detect_language(ext)
 
-            output = []
-            output.append(f"# {file_data.get('name', file_path)}\n\n")
-            output.append(f"**Repository:** {repo}\n")
-            output.append(f"**Path:** `{file_path}`\n")
+            output = io.StringIO()
+            output.write(f"# {file_name}\n\n")
+            output.write(f"**Repository:** {repo}\n")
+            output.write(f"**Path:** `{file_path}`\n")
             if branch:
-                output.append(f"**Branch:** {branch}\n")
-            output.append(f"**Size:** {file_size} bytes\n\n")
-            output.append("---\n\n")
-            output.append(
-                self._render_code_block(
-                    content,
-                    lang,
-                    user_valves.show_line_numbers,
-                    user_valves.syntax_highlighting,
-                )
+                output.write(f"**Branch:** {branch}\n")
+            output.write(f"**Size:** {file_size} bytes\n\n")
+            output.write("---\n\n")
+            self._write_code_block(
+                output,
+                content,
+                lang,
+                user_valves.show_line_numbers,
+                user_valves.syntax_highlighting,
             )
 
+            document = output.getvalue()
+
             if __event_emitter__:
                 file_url = f"https://github.com/{repo}/blob/{branch or self.valves.default_branch}/{file_path}"
                 await __event_emitter__(
                     {
                         "type": "citation",
                         "data": {
-                            "document": ["".join(output)],
+                            "document": [document],
                             "metadata": [
                                 {"source": f"GitHub: {repo}", "file_path": file_path}
                             ],
@@ -277,24 +597,12 @@ class Tools:
                     }
                 )
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
-                )
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
 
-            return "".join(output)
+            return document
 
         except Exception as e:
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": f"Error: {str(e)}", "done": True},
-                    }
-                )
+            await self._emit_status(__event_emitter__, f"Error: {str(e)}", done=True)
             return f"Error: {str(e)}"
 
     async def list_repository_files(
@@ -302,17 +610,14 @@ class Tools:
         repo: str = Field(..., description="Repository in format owner/repo"),
         path: str = Field(default="", description="Directory path"),
         branch: Optional[str] = Field(None, description="Branch name"),
+        recursive: bool = Field(
+            default=False, description="Include all subdirectories in one listing"
+        ),
         __user__: dict = {},
         __event_emitter__=None,
     ) -> str:
         """List files in a repository directory"""
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": f"Listing {repo}", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, f"Listing {repo}")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -320,48 +625,91 @@ class Tools:
                 return "Invalid repo format. Use owner/repo"
 
             owner, repo_name = owner_repo
-            endpoint = (
-                f"/repos/{owner}/{repo_name}/contents/{quote(path) if path else ''}"
-            )
-            params = {"ref": branch} if branch else {}
+            contents = None
+            truncated = False
+            if recursive:
+                # One trees call replaces a contents call per subdirectory
+                tree = await asyncio.to_thread(
+                    self._make_request,
+                    f"/repos/{owner}/{repo_name}/git/trees/"
+                    f"{quote(branch) if branch else 'HEAD'}",
+                    {"recursive": "1"},
+                )
+                truncated = tree.get("truncated", False)
+                if not truncated:
+                    entries = tree.get("tree", [])
+                    contents = self._tree_to_contents(entries, path)
+                    target = path.strip("/")
+                    if not contents and target:
+                        # Nothing under path: it is a file or does not exist
+                        entry = next(
+                            (e for e in entries if e.get("path") == target), None
+                        )
+                        if entry is None:
+                            raise self._api_error(404)
+                        if entry.get("type") == "blob":
+                            return f"{path} is a file. Use read_file to view it"
 
-            contents = self._make_request(endpoint, params)
+            if contents is None:
+                endpoint = self._contents_endpoint(owner, repo_name, path)
+                params = {"ref": branch} if branch else {}
+                contents = await asyncio.to_thread(self._make_request, endpoint, params)
 
             if isinstance(contents, dict) and contents.get("type") == "file":
                 return f"{path} is a file. Use read_file to view it"
+            groups = contents if recursive and not truncated else {"": contents}
 
-            output = []
-            output.append(f"# Contents: {repo}/{path or 'root'}\n\n")
+            output = io.StringIO()
+            output.write(f"# Contents: {repo}/{path or 'root'}\n\n")
             if branch:
-                output.append(f"**Branch:** {branch}\n\n")
-
-            dirs = [item for item in contents if item.get("type") == "dir"]
-            files = [item for item in contents if item.get("type") == "file"]
-
-            if dirs:
-                output.append("## Directories\n\n")
-                for d in sorted(dirs, key=lambda x: x["name"]):
-                    output.append(f"- **{d['name']}/**\n")
-                output.append("\n")
-
-            if files:
-                output.append("## Files\n\n")
-                for f in sorted(files, key=lambda x: x["name"]):
-                    size_str = self._format_size(f.get("size", 0))
-                    output.append(f"- `{f['name']}` ({size_str})\n")
-
-            if not dirs and not files:
-                output.append("*Empty directory*\n")
-
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
+                output.write(f"**Branch:** {branch}\n\n")
+            if truncated:
+                output.write(
+                    "*Repository too large for a recursive listing; "
+                    "showing this directory only*\n\n"
                 )
 
-            return "".join(output)
+            listed = False
+            # Parents before children, each directory's entries under one heading
+            for parent in sorted(groups, key=lambda d: d.split("/") if d else []):
+                dirs = []
+                files = []
+                append_dir, append_file = dirs.append, files.append
+                for item in groups[parent]:
+                    item_type = item.get("type")
+                    if item_type == "dir":
+                        append_dir(item)
+                    elif item_type == "file":
+                        append_file(item)
+                dirs.sort(key=_BY_NAME)
+                files.sort(key=_BY_NAME)
+                dir_lines = [f"- **{d['name']}/**\n" for d in dirs]
+                file_lines = [
+                    f"- `{f['name']}` ({self._format_size(f.get('size', 0))})\n"
+                    for f in files
+                ]
+                listed = listed or bool(dirs or files)
+
+                if parent:
+                    output.write(f"\n## {parent}/\n\n")
+                    output.writelines(dir_lines + file_lines)
+                    continue
+
+                if dirs:
+                    output.write("## Directories\n\n")
+                    output.writelines(dir_lines)
+                    output.write("\n")
+
+                if files:
+                    output.write("## Files\n\n")
+                    output.writelines(file_lines)
+
+            if not listed:
+                output.write("*Empty directory*\n")
+
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
+
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -373,13 +721,7 @@ class Tools:
         __event_emitter__=None,
     ) -> str:
         """Get repository information"""
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": f"Fetching {repo}", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, f"Fetching {repo}")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -387,51 +729,52 @@ class Tools:
                 return "Invalid repo format. Use owner/repo"
 
             owner, repo_name = owner_repo
-            repo_data = self._make_request(f"/repos/{owner}/{repo_name}")
+            repo_data, langs = await asyncio.gather(
+                asyncio.to_thread(self._make_request, f"/repos/{owner}/{repo_name}"),
+                asyncio.to_thread(
+                    self._make_request, f"/repos/{owner}/{repo_name}/languages"
+                ),
+                return_exceptions=True,
+            )
+            if isinstance(repo_data, Exception):
+                raise repo_data
 
-            output = []
-            output.append(f"# {repo_data.get('full_name', repo)}\n\n")
+            output = io.StringIO()
+            output.write(f"# {repo_data.get('full_name', repo)}\n\n")
 
             if repo_data.get("description"):
-                output.append(f"{repo_data['description']}\n\n")
+                output.write(f"{repo_data['description']}\n\n")
 
-            output.append("## Details\n\n")
-            output.append(
+            output.write("## Details\n\n")
+            output.write(
                 f"**Owner:** {repo_data.get('owner', {}).get('login', 'Unknown')}\n"
             )
-            output.append(f"**Branch:** {repo_data.get('default_branch', 'main')}\n")
-            output.append(
+            output.write(f"**Branch:** {repo_data.get('default_branch', 'main')}\n")
+            output.write(
                 f"**Language:** {repo_data.get('language', 'Not specified')}\n"
             )
-            output.append(f"**Stars:** {repo_data.get('stargazers_count', 0)}\n")
-            output.append(f"**Forks:** {repo_data.get('forks_count', 0)}\n")
-            output.append(
+            output.write(f"**Stars:** {repo_data.get('stargazers_count', 0)}\n")
+            output.write(f"**Forks:** {repo_data.get('forks_count', 0)}\n")
+            output.write(
                 f"**Visibility:** {'Private' if repo_data.get('private') else 'Public'}\n"
             )
-            output.append(f"\n**URL:** {repo_data.get('html_url', '')}\n")
-
-            try:
-                langs = self._make_request(f"/repos/{owner}/{repo_name}/languages")
-                if langs:
-                    output.append("\n## Languages\n\n")
-                    total = sum(langs.values())
+            output.write(f"\n**URL:** {repo_data.get('html_url', '')}\n")
+
+            # A failed languages lookup should not hide the repository details
+            if langs and not isinstance(langs, Exception):
+                output.write("\n## Languages\n\n")
+                total = sum(langs.values())
+                scale = 100.0 / total if total > 0 else 0.0
+                output.writelines(
+                    f"- **{lang}**: {bytes_count * scale:.1f}%\n"
                     for lang, bytes_count in sorted(
-                        langs.items(), key=lambda item: item[1], reverse=True
-                    ):
-                        pct = (bytes_count / total * 100) if total > 0 else 0
-                        output.append(f"- **{lang}**: {pct:.1f}%\n")
-            except Exception:
-                pass
-
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
+                        langs.items(), key=itemgetter(1), reverse=True
+                    )
                 )
 
-            return "".join(output)
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
+
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -446,22 +789,16 @@ class Tools:
         if not self.valves.github_token:
             return "GitHub token required to list your gists"
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Fetching your gists", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Fetching your gists")
 
         try:
-            gists = self._make_request("/gists", params={"per_page": min(limit, 100)})
+            gists = await self._get_pages("/gists", {}, limit)
 
             if not gists:
                 return "No gists found"
 
-            output = []
-            output.append(f"# Your Gists ({len(gists)} shown)\n\n")
+            output = io.StringIO()
+            output.write(f"# Your Gists ({len(gists)} shown)\n\n")
 
             for idx, gist in enumerate(gists, 1):
                 gist_id = gist["id"]
@@ -469,28 +806,22 @@ class Tools:
                 public = "Public" if gist.get("public") else "Secret"
                 created = gist.get("created_at", "Unknown")
 
-                files = list(gist.get("files", {}).keys())
-                file_list = ", ".join(files[:3])
+                files = gist.get("files", {})
+                file_list = ", ".join(itertools.islice(files, 3))
                 if len(files) > 3:
                     file_list += f" (+{len(files)-3} more)"
 
-                output.append(f"## {idx}. {description}\n\n")
-                output.append(f"**ID:** `{gist_id}`\n")
-                output.append(f"**Visibility:** {public}\n")
-                output.append(f"**Files:** {file_list}\n")
-                output.append(f"**Created:** {created}\n")
-                output.append(f"**URL:** {gist.get('html_url', '')}\n\n")
-                output.append("---\n\n")
+                output.write(f"## {idx}. {description}\n\n")
+                output.write(f"**ID:** `{gist_id}`\n")
+                output.write(f"**Visibility:** {public}\n")
+                output.write(f"**Files:** {file_list}\n")
+                output.write(f"**Created:** {created}\n")
+                output.write(f"**URL:** {gist.get('html_url', '')}\n\n")
+                output.write("---\n\n")
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
-                )
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
 
-            return "".join(output)
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -506,59 +837,43 @@ class Tools:
         if not isinstance(user_valves, self.UserValves):
             user_valves = self.UserValves()
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": f"Fetching gist {gist_id}", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, f"Fetching gist {gist_id}")
 
         try:
-            gist = self._make_request(f"/gists/{gist_id}")
+            gist = await asyncio.to_thread(self._make_request, f"/gists/{gist_id}")
 
-            output = []
+            output = io.StringIO()
             description = gist.get("description") or "Untitled Gist"
-            output.append(f"# {description}\n\n")
-            output.append(f"**ID:** `{gist['id']}`\n")
-            output.append(
+            output.write(f"# {description}\n\n")
+            output.write(f"**ID:** `{gist['id']}`\n")
+            output.write(
                 f"**Visibility:** {'Public' if gist.get('public') else 'Secret'}\n"
             )
-            output.append(
+            output.write(
                 f"**Owner:** {gist.get('owner', {}).get('login', 'Anonymous')}\n"
             )
-            output.append(f"**Created:** {gist.get('created_at', 'Unknown')}\n")
-            output.append(f"**Updated:** {gist.get('updated_at', 'Unknown')}\n")
-            output.append(f"**URL:** {gist.get('html_url', '')}\n\n")
-            output.append("---\n\n")
-
-            files = gist.get("files", {})
-            for filename, file_data in files.items():
-                content = file_data.get("content", "")
-                lang = file_data.get("language", "").lower()
-                size = file_data.get("size", 0)
-
-                output.append(f"## File: {filename}\n\n")
-                output.append(f"**Size:** {size} bytes\n")
-                if lang:
-                    output.append(f"**Language:** {lang}\n")
-                output.append("\n")
-                output.append(
-                    self._render_code_block(
-                        content,
-                        lang,
-                        user_valves.show_line_numbers,
-                        user_valves.syntax_highlighting,
-                    )
-                )
-                output.append("\n")
+            output.write(f"**Created:** {gist.get('created_at', 'Unknown')}\n")
+            output.write(f"**Updated:** {gist.get('updated_at', 'Unknown')}\n")
+            output.write(f"**URL:** {gist.get('html_url', '')}\n\n")
+            output.write("---\n\n")
+
+            # Formatting many large files is CPU work; keep it off the event loop
+            await asyncio.to_thread(
+                self._write_gist_files,
+                output,
+                gist.get("files", {}),
+                user_valves.show_line_numbers,
+                user_valves.syntax_highlighting,
+            )
+
+            document = output.getvalue()
 
             if __event_emitter__:
                 await __event_emitter__(
                     {
                         "type": "citation",
                         "data": {
-                            "document": ["".join(output)],
+                            "document": [document],
                             "metadata": [{"source": "GitHub Gist", "gist_id": gist_id}],
                             "source": {
                                 "name": f"Gist: {description}",
@@ -568,15 +883,9 @@ class Tools:
                     }
                 )
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
-                )
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
 
-            return "".join(output)
+            return document
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -596,13 +905,7 @@ class Tools:
         if not self.valves.github_token:
             return "GitHub token required to create gists"
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Creating gist", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Creating gist")
 
         try:
             files_dict = {}
@@ -627,29 +930,23 @@ class Tools:
 
             data = {"description": description, "public": public, "files": files_dict}
 
-            gist = self._make_request("/gists", method="POST", data=data)
+            gist = await asyncio.to_thread(
+                self._make_request, "/gists", method="POST", data=data
+            )
 
-            output = []
-            output.append("# Gist Created Successfully!\n\n")
-            output.append(f"**ID:** `{gist['id']}`\n")
-            output.append(f"**Description:** {description}\n")
-            output.append(f"**Visibility:** {'Public' if public else 'Secret'}\n")
-            output.append(f"**Files:** {', '.join(files_dict.keys())}\n")
-            output.append(f"\n**URL:** {gist.get('html_url', '')}\n")
+            output = io.StringIO()
+            output.write("# Gist Created Successfully!\n\n")
+            output.write(f"**ID:** `{gist['id']}`\n")
+            output.write(f"**Description:** {description}\n")
+            output.write(f"**Visibility:** {'Public' if public else 'Secret'}\n")
+            output.write(f"**Files:** {', '.join(files_dict.keys())}\n")
+            output.write(f"\n**URL:** {gist.get('html_url', '')}\n")
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Gist created",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__, "Gist created", done=True, hidden=True
+            )
 
-            return "".join(output)
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -669,13 +966,7 @@ class Tools:
         if not self.valves.github_token:
             return "GitHub token required to update gists"
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Updating gist", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Updating gist")
 
         try:
             data = {}
@@ -703,30 +994,24 @@ class Tools:
             if not data:
                 return "Nothing to update. Provide description or files"
 
-            gist = self._make_request(f"/gists/{gist_id}", method="PATCH", data=data)
+            gist = await asyncio.to_thread(
+                self._make_request, f"/gists/{gist_id}", method="PATCH", data=data
+            )
 
-            output = []
-            output.append("# Gist Updated Successfully!\n\n")
-            output.append(f"**ID:** `{gist['id']}`\n")
-            output.append(
+            output = io.StringIO()
+            output.write("# Gist Updated Successfully!\n\n")
+            output.write(f"**ID:** `{gist['id']}`\n")
+            output.write(
                 f"**Description:** {gist.get('description', 'No description')}\n"
             )
-            output.append(f"**Updated:** {gist.get('updated_at', 'Unknown')}\n")
-            output.append(f"\n**URL:** {gist.get('html_url', '')}\n")
+            output.write(f"**Updated:** {gist.get('updated_at', 'Unknown')}\n")
+            output.write(f"\n**URL:** {gist.get('html_url', '')}\n")
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Gist updated",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__, "Gist updated", done=True, hidden=True
+            )
 
-            return "".join(output)
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -741,28 +1026,16 @@ class Tools:
         if not self.valves.github_token:
             return "GitHub token required to delete gists"
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Deleting gist", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Deleting gist")
 
         try:
-            self._make_request(f"/gists/{gist_id}", method="DELETE")
+            await asyncio.to_thread(
+                self._make_request, f"/gists/{gist_id}", method="DELETE"
+            )
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Gist deleted",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__, "Gist deleted", done=True, hidden=True
+            )
 
             return f"Gist {gist_id} deleted successfully"
 
@@ -785,13 +1058,7 @@ class Tools:
         __event_emitter__=None,
     ) -> str:
         """List workflow runs for a repository"""
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Fetching workflow runs", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Fetching workflow runs")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -807,62 +1074,61 @@ class Tools:
             else:
                 endpoint = f"/repos/{owner}/{repo_name}/actions/runs"
 
-            params = {"per_page": min(limit, 100)}
+            params = {}
             if branch:
                 params["branch"] = branch
             if status:
                 params["status"] = status
 
-            data = self._make_request(endpoint, params)
-            runs = data.get("workflow_runs", [])
+            runs = await self._get_pages(endpoint, params, limit, "workflow_runs")
 
             if not runs:
                 return "No workflow runs found"
 
-            output = []
-            output.append(f"# Workflow Runs: {repo}\n\n")
+            output = io.StringIO()
+            output.write(f"# Workflow Runs: {repo}\n\n")
             if workflow_id:
-                output.append(f"**Workflow:** {workflow_id}\n")
+                output.write(f"**Workflow:** {workflow_id}\n")
             if branch:
-                output.append(f"**Branch:** {branch}\n")
+                output.write(f"**Branch:** {branch}\n")
             if status:
-                output.append(f"**Status Filter:** {status}\n")
-            output.append(f"\nShowing {len(runs)} run(s):\n\n")
+                output.write(f"**Status Filter:** {status}\n")
+            output.write(f"\nShowing {len(runs)} run(s):\n\n")
 
             for idx, run in enumerate(runs, 1):
-                run_id = run.get("id")
-                name = run.get("name", "Unknown")
-                run_number = run.get("run_number", "N/A")
-                status_val = run.get("status")
-                conclusion = run.get("conclusion")
-                branch_name = run.get("head_branch", "N/A")
-                commit = (run.get("head_sha") or "N/A")[:7]
-                created = run.get("created_at", "Unknown")
-                updated = run.get("updated_at", "Unknown")
-
-                status_label = self._format_workflow_status(status_val, conclusion)
-
-                output.append(f"## {idx}. {name} #{run_number}\n\n")
-                output.append(f"**Run ID:** `{run_id}`\n")
-                output.append(f"**Status:** {status_label}\n")
-                if conclusion:
-                    output.append(f"**Conclusion:** {conclusion}\n")
-                output.append(f"**Branch:** {branch_name}\n")
-                output.append(f"**Commit:** `{commit}`\n")
-                output.append(f"**Created:** {created}\n")
-                output.append(f"**Updated:** {updated}\n")
-                output.append(f"**URL:** {run.get('html_url', '')}\n\n")
-                output.append("---\n\n")
-
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
+                get = run.get
+                run_id = get("id")
+                name = get("name", "Unknown")
+                run_number = get("run_number", "N/A")
+                status_val = get("status")
+                conclusion = get("conclusion")
+                branch_name = get("head_branch", "N/A")
+                commit = (get("head_sha") or "N/A")[:7]
+                created = get("created_at", "Unknown")
+                updated = get("updated_at", "Unknown")
+
+                status_label = _format_workflow_status(status_val, conclusion)
+                conclusion_line = (
+                    f"**Conclusion:** {conclusion}\n" if conclusion else ""
                 )
 
-            return "".join(output)
+                # One formatted block per run rather than a write per field
+                output.write(
+                    f"## {idx}. {name} #{run_number}\n\n"
+                    f"**Run ID:** `{run_id}`\n"
+                    f"**Status:** {status_label}\n"
+                    f"{conclusion_line}"
+                    f"**Branch:** {branch_name}\n"
+                    f"**Commit:** `{commit}`\n"
+                    f"**Created:** {created}\n"
+                    f"**Updated:** {updated}\n"
+                    f"**URL:** {get('html_url', '')}\n\n"
+                    "---\n\n"
+                )
+
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
+
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -875,13 +1141,7 @@ class Tools:
         __event_emitter__=None,
     ) -> str:
         """Get detailed information about a specific workflow run"""
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": f"Fetching run #{run_id}", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, f"Fetching run #{run_id}")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -891,69 +1151,85 @@ class Tools:
             owner, repo_name = owner_repo
             endpoint = f"/repos/{owner}/{repo_name}/actions/runs/{run_id}"
 
-            run = self._make_request(endpoint)
+            # The run and its jobs are independent, so fetch them together
+            run, jobs_data = await asyncio.gather(
+                asyncio.to_thread(self._make_request, endpoint),
+                asyncio.to_thread(self._make_request, f"{endpoint}/jobs"),
+                return_exceptions=True,
+            )
+            if isinstance(run, Exception):
+                raise run
+
+            # Unchanged responses come back as the same cached objects, so a
+            # poll of an idle run can reuse the markdown rendered last time
+            rendered = self._render_cache.get(endpoint)
+            if rendered and rendered[0] is run and rendered[1] is jobs_data:
+                await self._emit_status(
+                    __event_emitter__, "Done", done=True, hidden=True
+                )
+                return rendered[2]
 
-            output = []
-            output.append(
-                f"# {run.get('name', 'Workflow Run')} #{run.get('run_number', run_id)}\n\n"
+            get = run.get
+            output = io.StringIO()
+            output.write(
+                f"# {get('name', 'Workflow Run')} #{get('run_number', run_id)}\n\n"
             )
 
-            status_val = run.get("status")
-            conclusion = run.get("conclusion")
-            status_label = self._format_workflow_status(status_val, conclusion)
+            status_val = get("status")
+            conclusion = get("conclusion")
+            status_label = _format_workflow_status(status_val, conclusion)
+            # actor and head_sha can be null, not just missing
+            actor = (get("actor") or {}).get("login", "Unknown")
 
-            output.append(f"**Status:** {status_label}\n")
+            output.write(f"**Status:** {status_label}\n")
             if conclusion:
-                output.append(f"**Conclusion:** {conclusion}\n")
-            output.append(f"**Run ID:** `{run.get('id')}`\n")
-            output.append(f"**Run Number:** #{run.get('run_number', 'N/A')}\n")
-            output.append(f"**Workflow:** {run.get('path', 'N/A')}\n")
-            output.append(f"**Branch:** {run.get('head_branch', 'N/A')}\n")
-            output.append(f"**Commit:** `{run.get('head_sha', 'N/A')[:7]}`\n")
-            output.append(f"**Event:** {run.get('event', 'N/A')}\n")
-            output.append(
-                f"**Actor:** {run.get('actor', {}).get('login', 'Unknown')}\n"
-            )
-            output.append(f"**Created:** {run.get('created_at', 'Unknown')}\n")
-            output.append(f"**Updated:** {run.get('updated_at', 'Unknown')}\n")
-            output.append(f"\n**URL:** {run.get('html_url', '')}\n\n")
+                output.write(f"**Conclusion:** {conclusion}\n")
+            output.write(f"**Run ID:** `{get('id')}`\n")
+            output.write(f"**Run Number:** #{get('run_number', 'N/A')}\n")
+            output.write(f"**Workflow:** {get('path', 'N/A')}\n")
+            output.write(f"**Branch:** {get('head_branch', 'N/A')}\n")
+            output.write(f"**Commit:** `{(get('head_sha') or 'N/A')[:7]}`\n")
+            output.write(f"**Event:** {get('event', 'N/A')}\n")
+            output.write(f"**Actor:** {actor}\n")
+            output.write(f"**Created:** {get('created_at', 'Unknown')}\n")
+            output.write(f"**Updated:** {get('updated_at', 'Unknown')}\n")
+            output.write(f"\n**URL:** {get('html_url', '')}\n\n")
 
-            jobs_endpoint = f"/repos/{owner}/{repo_name}/actions/runs/{run_id}/jobs"
             try:
-                jobs_data = self._make_request(jobs_endpoint)
+                if isinstance(jobs_data, Exception):
+                    raise jobs_data
                 jobs = jobs_data.get("jobs", [])
 
                 if jobs:
-                    output.append("## Jobs\n\n")
+                    output.write("## Jobs\n\n")
                     for job in jobs:
                         job_status = job.get("status")
                         job_conclusion = job.get("conclusion")
-                        job_label = self._format_workflow_status(
-                            job_status, job_conclusion
+                        job_label = _format_workflow_status(job_status, job_conclusion)
+
+                        conclusion_line = (
+                            f"**Conclusion:** {job_conclusion}\n"
+                            if job_conclusion
+                            else ""
                         )
 
-                        output.append(f"### {job.get('name', 'Unnamed Job')}\n\n")
-                        output.append(f"**Status:** {job_label}\n")
-                        if job_conclusion:
-                            output.append(f"**Conclusion:** {job_conclusion}\n")
-                        output.append(
+                        output.write(
+                            f"### {job.get('name', 'Unnamed Job')}\n\n"
+                            f"**Status:** {job_label}\n"
+                            f"{conclusion_line}"
                             f"**Started:** {job.get('started_at', 'Not started')}\n"
-                        )
-                        output.append(
-                            f"**Completed:** {job.get('completed_at', 'Not completed')}\n\n"
+                            f"**Completed:** "
+                            f"{job.get('completed_at', 'Not completed')}\n\n"
                         )
             except Exception:
                 pass
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
-                )
+            document = output.getvalue()
+            self._store(self._render_cache, endpoint, (run, jobs_data, document))
 
-            return "".join(output)
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
+
+            return document
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -978,13 +1254,7 @@ class Tools:
         if not self.valves.github_token:
             return "GitHub token required to trigger workflows"
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Triggering workflow", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Triggering workflow")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -1006,32 +1276,30 @@ class Tools:
             if inputs_dict:
                 data["inputs"] = inputs_dict
 
-            self._make_request(endpoint, method="POST", data=data)
+            await asyncio.to_thread(
+                self._make_request,
+                endpoint,
+                method="POST",
+                data=data,
+                expect_empty=True,
+            )
 
-            output = []
-            output.append("# Workflow Triggered Successfully!\n\n")
-            output.append(f"**Repository:** {repo}\n")
-            output.append(f"**Workflow:** {workflow_id}\n")
-            output.append(f"**Ref:** {ref}\n")
+            output = io.StringIO()
+            output.write("# Workflow Triggered Successfully!\n\n")
+            output.write(f"**Repository:** {repo}\n")
+            output.write(f"**Workflow:** {workflow_id}\n")
+            output.write(f"**Ref:** {ref}\n")
             if inputs:
-                output.append(f"**Inputs:** Provided\n")
-            output.append(
+                output.write(f"**Inputs:** Provided\n")
+            output.write(
                 f"\n**Note:** The workflow run has been queued. Use `list_workflow_runs` to check its status.\n"
             )
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Workflow triggered",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__, "Workflow triggered", done=True, hidden=True
+            )
 
-            return "".join(output)
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -1039,17 +1307,12 @@ class Tools:
     async def list_workflows(
         self,
         repo: str = Field(..., description="Repository in format owner/repo"),
+        limit: int = Field(default=30, description="Number of workflows to list"),
         __user__: dict = {},
         __event_emitter__=None,
     ) -> str:
         """List all workflows in a repository"""
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Fetching workflows", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Fetching workflows")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -1059,39 +1322,35 @@ class Tools:
             owner, repo_name = owner_repo
             endpoint = f"/repos/{owner}/{repo_name}/actions/workflows"
 
-            data = self._make_request(endpoint)
-            workflows = data.get("workflows", [])
+            workflows = await self._get_pages(endpoint, {}, limit, "workflows")
 
             if not workflows:
                 return "No workflows found in this repository"
 
-            output = []
-            output.append(f"# Workflows in {repo}\n\n")
-            output.append(f"Total: {len(workflows)} workflow(s)\n\n")
+            output = io.StringIO()
+            output.write(f"# Workflows in {repo}\n\n")
+            output.write(f"Total: {len(workflows)} workflow(s)\n\n")
 
             for idx, workflow in enumerate(workflows, 1):
-                workflow_id = workflow.get("id")
-                name = workflow.get("name", "Unnamed")
-                path = workflow.get("path", "N/A")
-                state = workflow.get("state", "unknown")
+                get = workflow.get
+                workflow_id = get("id")
+                name = get("name", "Unnamed")
+                path = get("path", "N/A")
+                state = get("state", "unknown")
                 state_label = state.replace("_", " ").title() if state else "Unknown"
 
-                output.append(f"## {idx}. {name}\n\n")
-                output.append(f"**ID:** `{workflow_id}`\n")
-                output.append(f"**Path:** `{path}`\n")
-                output.append(f"**State:** {state_label}\n")
-                output.append(f"**URL:** {workflow.get('html_url', '')}\n\n")
-                output.append("---\n\n")
-
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": "Done", "done": True, "hidden": True},
-                    }
+                output.write(
+                    f"## {idx}. {name}\n\n"
+                    f"**ID:** `{workflow_id}`\n"
+                    f"**Path:** `{path}`\n"
+                    f"**State:** {state_label}\n"
+                    f"**URL:** {get('html_url', '')}\n\n"
+                    "---\n\n"
                 )
 
-            return "".join(output)
+            await self._emit_status(__event_emitter__, "Done", done=True, hidden=True)
+
+            return output.getvalue()
 
         except Exception as e:
             return f"Error: {str(e)}"
@@ -1107,13 +1366,7 @@ class Tools:
         if not self.valves.github_token:
             return "GitHub token required to cancel workflow runs"
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {"description": "Cancelling workflow run", "done": False},
-                }
-            )
+        await self._emit_status(__event_emitter__, "Cancelling workflow run")
 
         try:
             owner_repo = self._split_repo(repo)
@@ -1123,19 +1376,17 @@ class Tools:
             owner, repo_name = owner_repo
             endpoint = f"/repos/{owner}/{repo_name}/actions/runs/{run_id}/cancel"
 
-            self._make_request(endpoint, method="POST", data={})
+            await asyncio.to_thread(
+                self._make_request,
+                endpoint,
+                method="POST",
+                data={},
+                expect_empty=True,
+            )
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Run cancelled",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__, "Run cancelled", done=True, hidden=True
+            )
 
             return f"Workflow run #{run_id} has been cancelled successfully"
 
@@ -6,16 +6,114 @@ funding_url: https://github.com/sponsors/mplogas
 version: 1.0.1
 license: MIT
 description: Search and retrieve documents from your Paperless-ngx instance. Supports full-text search, filtering, and document content extraction for AI-powered summaries.
-requirements: requests>=2.31.0
+requirements: aiohttp
 required_open_webui_version: 0.4.0
 """
 
+import asyncio
+import io
+import json
+import random
 import re
+import time
+from collections import deque
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from urllib.parse import urljoin, quote
+from typing import Optional, List, Dict, Any, Tuple
+from urllib.parse import quote
 from pydantic import BaseModel, Field
-import requests
+import aiohttp
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_CACHE_MAX_ENTRIES = 1024
+# Short enough that new or edited documents show up on the next question
+_DOCUMENT_CACHE_TTL = 30
+_MAX_RETRIES = 3
+_MAX_RETRY_WAIT = 8
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_SEP = "---\n\n"
+# Only the fields _format_document reads, so listings skip permissions, custom
+# fields and file metadata the tool never shows
+_DOC_FIELDS = (
+    "id,title,created,added,correspondent,document_type,tags,"
+    "archive_serial_number,notes,__search_hit__"
+)
+_DOC_CONTENT_FIELDS = _DOC_FIELDS + ",content"
+# Listed by document count (descending) then by name, sorted by Paperless
+_TAG_PARAMS = {
+    "page_size": 1000,
+    "fields": "id,name,document_count,color",
+    "ordering": "-document_count,name",
+}
+_MAX_REFERENCE_ITEMS = 10000
+_NAMED_PARAMS = {
+    "page_size": 1000,
+    "fields": "id,name,document_count",
+    "ordering": "-document_count,name",
+}
+# Scalar metadata rendered as-is, in display order ahead of the related objects
+_SIMPLE_FIELDS = {"created": "**Created:** {}\n", "added": "**Added:** {}\n"}
+
+
+class RateLimiter:
+    """Allow at most max_rate requests per time_period seconds."""
+
+    def __init__(self, max_rate: int, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._sent: deque = deque()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        if self.max_rate <= 0:
+            return self
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.time_period:
+                    self._sent.popleft()
+                if len(self._sent) < self.max_rate:
+                    self._sent.append(now)
+                    return self
+                await asyncio.sleep(self.time_period - (now - self._sent[0]))
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+# Shared by every Tools instance since they all talk to the same Paperless server
+_RATE_LIMITER = RateLimiter(max_rate=10, time_period=1.0)
+
+# Also shared, so new chats reuse warm keep-alive connections; keyed by the
+# event loop it was created on since an aiohttp session can't cross loops
+_SESSION: Optional[Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = None
+
+
+def _count_entry(item: Dict[str, Any], extra: str = "") -> str:
+    """Render one tag, correspondent or document type listing line"""
+    doc_count = item.get("document_count", 0)
+    plural = "s" if doc_count != 1 else ""
+    name = item.get("name", "Unnamed")
+    return f"- **{name}** (ID: {item['id']}) - {doc_count} document{plural}{extra}\n"
+
+
+def _named(value: Any) -> str:
+    """Name of an expanded related object, or the raw ID as text"""
+    if isinstance(value, dict):
+        return value.get("name", "Unknown")
+    return str(value)
+
+
+def _render_meta(doc: Dict[str, Any]) -> str:
+    """Render the scalar metadata lines of a document"""
+    values = ((fmt, doc.get(key)) for key, fmt in _SIMPLE_FIELDS.items())
+    return "".join([fmt.format(value) for fmt, value in values if value])
 
 
 class Tools:
@@ -23,6 +121,14 @@ class Tools:
         """Initialize the Paperless-ngx Document Search tool."""
         self.valves = self.Valves()
         self.citation = False  # We'll handle citations manually
+        self._cache: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
+        self._etags: Dict[tuple, Tuple[str, Dict[str, Any]]] = {}
+        self._name_indexes: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._headers: Optional[Dict[str, str]] = None
+        self._headers_key: Optional[Tuple[str, int]] = None
+        self._default_user_valves = self.UserValves()
+        self._user_valves: Dict[tuple, "Tools.UserValves"] = {}
 
     class Valves(BaseModel):
         """Admin-configurable settings"""
@@ -48,6 +154,14 @@ class Tools:
         enable_status_updates: bool = Field(
             default=True, description="Show status updates during operations"
         )
+        requests_per_second: int = Field(
+            default=10,
+            description="Maximum API requests per second to Paperless (0 disables the limit)",
+        )
+        cache_ttl_seconds: int = Field(
+            default=300,
+            description="How long to cache tags, correspondents and document types (0 disables)",
+        )
 
     class UserValves(BaseModel):
         """User-configurable settings"""
@@ -63,28 +177,172 @@ class Tools:
             default=True, description="Show search term highlights in results"
         )
 
+    async def _emit_status(
+        self, emitter, description: str, done: bool = False, hidden: bool = False
+    ) -> None:
+        if not emitter or not self.valves.enable_status_updates:
+            return
+        data: Dict[str, Any] = {"description": description, "done": done}
+        if hidden:
+            data["hidden"] = True
+        await emitter({"type": "status", "data": data})
+
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authentication"""
-        headers = {
-            "Authorization": f"Token {self.valves.api_token}",
-            "Accept": f"application/json; version={self.valves.api_version}",
+        # Shared between requests; callers must copy before modifying it
+        key = (self.valves.api_token, self.valves.api_version)
+        if self._headers is None or self._headers_key != key:
+            self._headers = {
+                "Authorization": f"Token {key[0]}",
+                "Accept": f"application/json; version={key[1]}",
+            }
+            self._headers_key = key
+        return self._headers
+
+    def _resolve_user_valves(self, user: dict) -> "Tools.UserValves":
+        """Get the calling user's valves as a UserValves instance"""
+        raw = user.get("valves")
+        if isinstance(raw, self.UserValves):
+            return raw
+        if raw is None:
+            return self._default_user_valves
+
+        # Settings rarely change between calls, so skip re-validating them
+        raw = dict(raw)
+        try:
+            key = tuple(sorted(raw.items()))
+            user_valves = self._user_valves.get(key)
+        except TypeError:
+            # Unhashable or unorderable values are validated every time
+            return self.UserValves.model_validate(raw)
+        if user_valves is None:
+            user_valves = self.UserValves.model_validate(raw)
+            if len(self._user_valves) >= _CACHE_MAX_ENTRIES:
+                self._user_valves.pop(next(iter(self._user_valves)))
+            self._user_valves[key] = user_valves
+        return user_valves
+
+    def _document_fields(self, user_valves: "Tools.UserValves") -> str:
+        """Field projection for document requests, with content only if wanted"""
+        return _DOC_CONTENT_FIELDS if user_valves.include_content else _DOC_FIELDS
+
+    def _citation(
+        self, doc_id: int, title: str, document: str, metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the citation event for a Paperless document"""
+        return {
+            "type": "citation",
+            "data": {
+                "document": [document],
+                "metadata": [metadata],
+                "source": {
+                    "name": f"#{doc_id}: {title}",
+                    "url": self._url(f"/documents/{doc_id}"),
+                },
+            },
         }
-        return headers
 
-    def _make_request(
-        self, endpoint: str, params: Optional[Dict] = None, method: str = "GET"
+    def _url(self, path: str) -> str:
+        """Build an absolute URL for a path on the Paperless-ngx instance"""
+        return f"{self.valves.paperless_url.rstrip('/')}{path}"
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop
+        global _SESSION
+        loop = asyncio.get_running_loop()
+        if _SESSION is None or _SESSION[0] is not loop or _SESSION[1].closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=10, limit_per_host=10, keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            _SESSION = (loop, session)
+        return _SESSION[1]
+
+    async def aclose(self):
+        # Closes the session shared by every instance; the next call reopens it
+        global _SESSION
+        if _SESSION is not None and not _SESSION[1].closed:
+            await _SESSION[1].close()
+        _SESSION = None
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        method: str = "GET",
+        cache_ttl: int = 0,
+        conditional: bool = False,
     ) -> Dict[str, Any]:
         """Make an API request to Paperless-ngx"""
-        url = urljoin(self.valves.paperless_url, endpoint)
-
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        if cache_ttl > 0:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            # Concurrent callers on a cold cache share one request
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = asyncio.ensure_future(
+                    self._make_request(
+                        endpoint, params, method, conditional=conditional
+                    )
+                )
+                self._inflight[key] = pending
+                pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+            result = await asyncio.shield(pending)
+
+            if len(self._cache) >= _CACHE_MAX_ENTRIES:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (time.monotonic() + cache_ttl, result)
+            return result
+        elif method != "GET":
+            # Writes may change the cached reference data
+            self._cache.clear()
+            self._etags.clear()
+
+        headers = self._get_headers()
+        tagged = self._etags.get(key) if conditional else None
+        if tagged:
+            headers = {**headers, "If-None-Match": tagged[0]}
+
+        url = self._url(endpoint)
+        session = self._get_session()
+        _RATE_LIMITER.max_rate = self.valves.requests_per_second
         try:
-            response = requests.request(
-                method, url, headers=self._get_headers(), params=params, timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            for attempt in range(_MAX_RETRIES + 1):
+                async with _RATE_LIMITER, session.request(
+                    method, url, headers=headers, params=params
+                ) as response:
+                    if (
+                        response.status in _RETRY_STATUSES
+                        and method == "GET"
+                        and attempt < _MAX_RETRIES
+                    ):
+                        # Honour the server's hint, else back off with jitter
+                        retry_after = response.headers.get("Retry-After", "")
+                        if retry_after.isdigit():
+                            retry_delay = min(_MAX_RETRY_WAIT, int(retry_after))
+                        else:
+                            retry_delay = 0.2 * 2**attempt + random.random() * 0.1
+                    elif tagged and response.status == 304:
+                        result = tagged[1]
+                        break
+                    else:
+                        response.raise_for_status()
+                        result = _json_loads(await response.read())
+                        etag = response.headers.get("ETag") if conditional else None
+                        if etag:
+                            if len(self._etags) >= _CACHE_MAX_ENTRIES:
+                                self._etags.pop(next(iter(self._etags)))
+                            self._etags[key] = (etag, result)
+                        break
+                await asyncio.sleep(retry_delay)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
             raise Exception(f"API request failed: {str(e)}")
+        return result
 
     async def search_documents(
         self,
@@ -110,152 +368,101 @@ class Tools:
             return "Paperless-ngx API token not configured. Please set it in the tool settings."
 
         # Get user preferences
-        user_valves = __user__.get("valves", self.UserValves())
-        if not isinstance(user_valves, self.UserValves):
-            user_valves = self.UserValves(**dict(user_valves))
+        user_valves = self._resolve_user_valves(__user__)
 
         max_results = min(user_valves.max_results, 25)  # Cap at 25
 
         # Emit initial status
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {
-                        "description": f"Searching Paperless for: {query}",
-                        "done": False,
-                    },
-                }
-            )
+        await self._emit_status(__event_emitter__, f"Searching Paperless for: {query}")
 
         try:
             # Search for documents
             search_params = {
                 "query": query,
                 "page_size": max_results,
-                "truncate_content": True,
+                "fields": self._document_fields(user_valves),
             }
 
-            results = self._make_request("/api/documents/", params=search_params)
+            results = await self._make_request("/api/documents/", params=search_params)
 
             if not results.get("results"):
-                if __event_emitter__ and self.valves.enable_status_updates:
-                    await __event_emitter__(
-                        {
-                            "type": "status",
-                            "data": {"description": "No documents found", "done": True},
-                        }
-                    )
+                await self._emit_status(
+                    __event_emitter__, "No documents found", done=True
+                )
                 return f"No documents found matching: '{query}'"
 
             documents = results["results"]
             total_count = results.get("count", len(documents))
 
             # Update status
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": f"Found {total_count} documents, retrieving content...",
-                            "done": False,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__,
+                f"Found {total_count} documents, retrieving content...",
+            )
 
             # Format results
-            output_parts = [f"# Search Results for: {query}\n"]
-            output_parts.append(
+            output = io.StringIO()
+            output.write(f"# Search Results for: {query}\n")
+            output.write(
                 f"Found {total_count} documents, showing top {len(documents)}:\n\n"
             )
-            output_parts.append("---\n\n")
+            output.write(_SEP)
 
-            for idx, doc in enumerate(documents, 1):
+            # Retrieve full content concurrently if requested
+            include_content = user_valves.include_content
+            max_size = self.valves.max_document_size
+            contents = [None] * len(documents)
+            if include_content:
+                contents = await self._get_contents(documents)
+
+            citations = []
+            for idx, (doc, content) in enumerate(zip(documents, contents), 1):
                 doc_id = doc["id"]
                 title = doc.get("title", "Untitled")
 
                 # Format document metadata
                 doc_output = self._format_document(doc, idx, user_valves)
-                output_parts.append(doc_output)
-
-                # Retrieve full content if requested
-                if user_valves.include_content:
-                    content = self._get_document_content(doc_id)
-                    if content:
-                        # Truncate if too large
-                        if len(content) > self.valves.max_document_size:
-                            content = (
-                                content[: self.valves.max_document_size]
-                                + "\n\n[Content truncated...]"
-                            )
-                        output_parts.append(
-                            f"\n**Full Document Content:**\n\n{content}\n\n"
-                        )
+                output.write(doc_output)
+
+                if content:
+                    # Truncate if too large
+                    if len(content) > max_size:
+                        content = content[:max_size] + "\n\n[Content truncated...]"
+                    output.write(f"\n**Full Document Content:**\n\n{content}\n\n")
 
                 # Emit citation for this document
                 if __event_emitter__:
-                    doc_url = urljoin(self.valves.paperless_url, f"/documents/{doc_id}")
-
-                    await __event_emitter__(
-                        {
-                            "type": "citation",
-                            "data": {
-                                "document": [
-                                    doc_output
-                                    + (
-                                        f"\n\n{content}"
-                                        if user_valves.include_content and content
-                                        else ""
-                                    )
-                                ],
-                                "metadata": [
-                                    {
-                                        "source": f"Paperless Document #{doc_id}",
-                                        "title": title,
-                                        "document_id": doc_id,
-                                        "added": doc.get("added"),
-                                        "correspondent": (
-                                            doc.get("correspondent", {}).get("name")
-                                            if isinstance(
-                                                doc.get("correspondent"), dict
-                                            )
-                                            else None
-                                        ),
-                                    }
-                                ],
-                                "source": {
-                                    "name": f"#{doc_id}: {title}",
-                                    "url": doc_url,
-                                },
-                            },
-                        }
+                    corr = doc.get("correspondent")
+                    corr_name = corr.get("name") if isinstance(corr, dict) else None
+                    # content is only set when include_content is on
+                    body = f"{doc_output}\n\n{content}" if content else doc_output
+                    metadata = {
+                        "source": f"Paperless Document #{doc_id}",
+                        "title": title,
+                        "document_id": doc_id,
+                        "added": doc.get("added"),
+                        "correspondent": corr_name,
+                    }
+                    citations.append(
+                        __event_emitter__(self._citation(doc_id, title, body, metadata))
                     )
 
-                output_parts.append("---\n\n")
+                output.write(_SEP)
+
+            await asyncio.gather(*citations, return_exceptions=True)
 
             # Completion status
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": f"Retrieved {len(documents)} documents",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__,
+                f"Retrieved {len(documents)} documents",
+                done=True,
+                hidden=True,
+            )
 
-            return "".join(output_parts)
+            return output.getvalue()
 
         except Exception as e:
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {"description": f"Error: {str(e)}", "done": True},
-                    }
-                )
+            await self._emit_status(__event_emitter__, f"Error: {str(e)}", done=True)
             return f"Error searching documents: {str(e)}"
 
 
@@ -279,24 +486,20 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
 
-        user_valves = __user__.get("valves", self.UserValves())
-        if not isinstance(user_valves, self.UserValves):
-            user_valves = self.UserValves(**dict(user_valves))
-
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {
-                        "description": f"Retrieving document #{document_id}",
-                        "done": False,
-                    },
-                }
-            )
+        user_valves = self._resolve_user_valves(__user__)
+
+        await self._emit_status(
+            __event_emitter__, f"Retrieving document #{document_id}"
+        )
 
         try:
             # Get document metadata
-            doc = self._make_request(f"/api/documents/{document_id}/")
+            doc = await self._make_request(
+                f"/api/documents/{document_id}/",
+                params={"fields": self._document_fields(user_valves)},
+                cache_ttl=_DOCUMENT_CACHE_TTL,
+                conditional=True,
+            )
 
             output_parts = [
                 self._format_document(doc, position=None, user_valves=user_valves)
@@ -304,7 +507,9 @@ class Tools:
 
             # Get full content
             if user_valves.include_content:
-                content = self._get_document_content(document_id)
+                content = doc.get("content")
+                if content is None:
+                    content = await self._get_document_content(document_id)
                 if content:
                     if len(content) > self.valves.max_document_size:
                         content = (
@@ -317,40 +522,22 @@ class Tools:
 
             # Emit citation
             if __event_emitter__:
-                doc_url = urljoin(
-                    self.valves.paperless_url, f"/documents/{document_id}"
-                )
+                title = doc.get("title", "Untitled")
+                metadata = {
+                    "source": f"Paperless Document #{document_id}",
+                    "title": title,
+                    "document_id": document_id,
+                }
                 await __event_emitter__(
-                    {
-                        "type": "citation",
-                        "data": {
-                            "document": ["".join(output_parts)],
-                            "metadata": [
-                                {
-                                    "source": f"Paperless Document #{document_id}",
-                                    "title": doc.get("title", "Untitled"),
-                                    "document_id": document_id,
-                                }
-                            ],
-                            "source": {
-                                "name": f"#{document_id}: {doc.get('title', 'Untitled')}",
-                                "url": doc_url,
-                            },
-                        },
-                    }
+                    self._citation(document_id, title, "".join(output_parts), metadata)
                 )
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Document retrieved successfully",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__,
+                "Document retrieved successfully",
+                done=True,
+                hidden=True,
+            )
 
             return "".join(output_parts)
 
@@ -377,84 +564,62 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
 
-        user_valves = __user__.get("valves", self.UserValves())
-        if not isinstance(user_valves, self.UserValves):
-            user_valves = self.UserValves(**dict(user_valves))
-
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {
-                        "description": f"Finding documents similar to #{document_id}",
-                        "done": False,
-                    },
-                }
-            )
+        user_valves = self._resolve_user_valves(__user__)
 
-        try:
-            # First get the reference document
-            ref_doc = self._make_request(f"/api/documents/{document_id}/")
-            ref_title = ref_doc.get("title", "Untitled")
+        await self._emit_status(
+            __event_emitter__, f"Finding documents similar to #{document_id}"
+        )
 
-            # Find similar documents
+        try:
+            # Fetch the reference title and the similar documents together
             params = {
                 "more_like_id": document_id,
                 "page_size": min(user_valves.max_results, 25),
+                "fields": _DOC_FIELDS,
             }
-            results = self._make_request("/api/documents/", params=params)
+            ref_doc, results = await asyncio.gather(
+                self._make_request(
+                    f"/api/documents/{document_id}/",
+                    params={"fields": "title"},
+                    cache_ttl=_DOCUMENT_CACHE_TTL,
+                ),
+                self._make_request("/api/documents/", params=params),
+            )
+            ref_title = ref_doc.get("title", "Untitled")
 
             if not results.get("results"):
                 return f"No similar documents found for #{document_id}: {ref_title}"
 
             documents = results["results"]
 
-            output_parts = [f"# Documents Similar to: {ref_title} (#{document_id})\n\n"]
-            output_parts.append(f"Found {len(documents)} similar documents:\n\n")
-            output_parts.append("---\n\n")
+            output = io.StringIO()
+            output.write(f"# Documents Similar to: {ref_title} (#{document_id})\n\n")
+            output.write(f"Found {len(documents)} similar documents:\n\n")
+            output.write(_SEP)
 
+            citations = []
             for idx, doc in enumerate(documents, 1):
                 doc_output = self._format_document(doc, idx, user_valves)
-                output_parts.append(doc_output)
-                output_parts.append("---\n\n")
+                output.write(doc_output)
+                output.write(_SEP)
 
                 # Emit citations
                 if __event_emitter__:
-                    doc_url = urljoin(
-                        self.valves.paperless_url, f"/documents/{doc['id']}"
-                    )
-                    await __event_emitter__(
-                        {
-                            "type": "citation",
-                            "data": {
-                                "document": [doc_output],
-                                "metadata": [
-                                    {
-                                        "document_id": doc["id"],
-                                        "title": doc.get("title"),
-                                    }
-                                ],
-                                "source": {
-                                    "name": f"#{doc['id']}: {doc.get('title', 'Untitled')}",
-                                    "url": doc_url,
-                                },
-                            },
-                        }
+                    doc_id = doc["id"]
+                    title = doc.get("title")
+                    metadata = {"document_id": doc_id, "title": title}
+                    citation = self._citation(
+                        doc_id, title or "Untitled", doc_output, metadata
                     )
+                    citations.append(__event_emitter__(citation))
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Similar documents retrieved",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await asyncio.gather(*citations, return_exceptions=True)
 
-            return "".join(output_parts)
+            await self._emit_status(
+                __event_emitter__, "Similar documents retrieved", done=True, hidden=True
+            )
+
+            return output.getvalue()
 
         except Exception as e:
             return f"Error finding similar documents: {str(e)}"
@@ -499,12 +664,13 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
 
-        user_valves = __user__.get("valves", self.UserValves())
-        if not isinstance(user_valves, self.UserValves):
-            user_valves = self.UserValves(**dict(user_valves))
+        user_valves = self._resolve_user_valves(__user__)
 
         # Build search parameters
-        params = {"page_size": min(user_valves.max_results, 25)}
+        params = {
+            "page_size": min(user_valves.max_results, 25),
+            "fields": self._document_fields(user_valves),
+        }
 
         if query:
             params["query"] = query
@@ -532,19 +698,12 @@ class Tools:
             date_range = f"{created_after or '...'} to {created_before or '...'}"
             filter_desc.append(f"dates: {date_range}")
 
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {
-                        "description": f"Searching with filters: {', '.join(filter_desc)}",
-                        "done": False,
-                    },
-                }
-            )
+        await self._emit_status(
+            __event_emitter__, f"Searching with filters: {', '.join(filter_desc)}"
+        )
 
         try:
-            results = self._make_request("/api/documents/", params=params)
+            results = await self._make_request("/api/documents/", params=params)
 
             if not results.get("results"):
                 return f"No documents found matching filters: {', '.join(filter_desc)}"
@@ -552,42 +711,36 @@ class Tools:
             documents = results["results"]
             total_count = results.get("count", len(documents))
 
-            output_parts = [f"# Advanced Search Results\n"]
-            output_parts.append(f"**Filters:** {', '.join(filter_desc)}\n\n")
-            output_parts.append(
+            output = io.StringIO()
+            output.write("# Advanced Search Results\n")
+            output.write(f"**Filters:** {', '.join(filter_desc)}\n\n")
+            output.write(
                 f"Found {total_count} documents, showing top {len(documents)}:\n\n"
             )
-            output_parts.append("---\n\n")
+            output.write(_SEP)
 
-            for idx, doc in enumerate(documents, 1):
+            include_content = user_valves.include_content
+            max_size = self.valves.max_document_size
+            contents = [None] * len(documents)
+            if include_content:
+                contents = await self._get_contents(documents)
+
+            for idx, (doc, content) in enumerate(zip(documents, contents), 1):
                 doc_output = self._format_document(doc, idx, user_valves)
-                output_parts.append(doc_output)
+                output.write(doc_output)
 
-                if user_valves.include_content:
-                    content = self._get_document_content(doc["id"])
-                    if content:
-                        if len(content) > self.valves.max_document_size:
-                            content = (
-                                content[: self.valves.max_document_size]
-                                + "\n\n[Content truncated...]"
-                            )
-                        output_parts.append(f"\n**Content:**\n\n{content}\n\n")
+                if content:
+                    if len(content) > max_size:
+                        content = content[:max_size] + "\n\n[Content truncated...]"
+                    output.write(f"\n**Content:**\n\n{content}\n\n")
 
-                output_parts.append("---\n\n")
+                output.write(_SEP)
 
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": "Search completed",
-                            "done": True,
-                            "hidden": True,
-                        },
-                    }
-                )
+            await self._emit_status(
+                __event_emitter__, "Search completed", done=True, hidden=True
+            )
 
-            return "".join(output_parts)
+            return output.getvalue()
 
         except Exception as e:
             return f"Error in advanced search: {str(e)}"
@@ -600,86 +753,162 @@ class Tools:
     ) -> str:
         """Format a document's metadata for display"""
 
-        parts = []
-
         # Title and ID
         title = doc.get("title", "Untitled")
-        doc_id = doc["id"]
-        if position:
-            parts.append(f"## {position}. {title} (ID: #{doc_id})\n\n")
-        else:
-            parts.append(f"## {title} (ID: #{doc_id})\n\n")
+        prefix = f"{position}. " if position else ""
 
         # Search relevance (if available)
-        if "__search_hit__" in doc:
-            search_hit = doc["__search_hit__"]
-            score = search_hit.get("score", 0)
-            parts.append(f"**Relevance Score:** {score:.3f}\n\n")
+        relevance = ""
+        search_hit = doc.get("__search_hit__")
+        if search_hit is not None:
+            relevance = f"**Relevance Score:** {search_hit.get('score', 0):.3f}\n\n"
 
             if user_valves.show_highlights and search_hit.get("highlights"):
                 # Clean HTML tags from highlights for plain text display
-                highlights = re.sub(r"<[^>]+>", "**", search_hit["highlights"])
-                parts.append(f"**Highlights:** {highlights}\n\n")
-
-        # Metadata
-        if doc.get("created"):
-            parts.append(f"**Created:** {doc['created']}\n")
-        if doc.get("added"):
-            parts.append(f"**Added:** {doc['added']}\n")
+                highlights = _HTML_TAG_RE.sub("**", search_hit["highlights"])
+                relevance += f"**Highlights:** {highlights}\n\n"
 
         # Correspondent
         correspondent = doc.get("correspondent")
-        if correspondent:
-            if isinstance(correspondent, dict):
-                parts.append(
-                    f"**Correspondent:** {correspondent.get('name', 'Unknown')}\n"
-                )
-            else:
-                parts.append(f"**Correspondent ID:** {correspondent}\n")
+        correspondent_line = ""
+        if isinstance(correspondent, dict):
+            correspondent_line = f"**Correspondent:** {_named(correspondent)}\n"
+        elif correspondent:
+            correspondent_line = f"**Correspondent ID:** {correspondent}\n"
 
         # Document Type
         doc_type = doc.get("document_type")
-        if doc_type:
-            if isinstance(doc_type, dict):
-                parts.append(f"**Type:** {doc_type.get('name', 'Unknown')}\n")
-            else:
-                parts.append(f"**Type ID:** {doc_type}\n")
+        type_line = ""
+        if isinstance(doc_type, dict):
+            type_line = f"**Type:** {_named(doc_type)}\n"
+        elif doc_type:
+            type_line = f"**Type ID:** {doc_type}\n"
 
         # Tags
-        tags = doc.get("tags", [])
-        if tags:
-            tag_names = []
-            for tag in tags:
-                if isinstance(tag, dict):
-                    tag_names.append(tag.get("name", "Unknown"))
-                else:
-                    tag_names.append(str(tag))
-            parts.append(f"**Tags:** {', '.join(tag_names)}\n")
+        tags = doc.get("tags", ())
+        tags_line = f"**Tags:** {', '.join(map(_named, tags))}\n" if tags else ""
 
         # Archive Serial Number
         asn = doc.get("archive_serial_number")
-        if asn:
-            parts.append(f"**ASN:** {asn}\n")
+        asn_line = f"**ASN:** {asn}\n" if asn else ""
 
         # Notes preview
+        notes_block = ""
         if doc.get("notes"):
             notes_preview = doc["notes"][:200]
             if len(doc["notes"]) > 200:
                 notes_preview += "..."
-            parts.append(f"\n**Notes:** {notes_preview}\n")
+            notes_block = f"\n**Notes:** {notes_preview}\n"
 
-        parts.append("\n")
-        return "".join(parts)
+        return (
+            f"## {prefix}{title} (ID: #{doc['id']})\n\n{relevance}{_render_meta(doc)}"
+            f"{correspondent_line}{type_line}{tags_line}{asn_line}{notes_block}\n"
+        )
 
-    def _get_document_content(self, document_id: int) -> Optional[str]:
+    async def _get_document_content(self, document_id: int) -> Optional[str]:
         """Retrieve the full text content of a document"""
         try:
-            doc = self._make_request(f"/api/documents/{document_id}/")
+            # Only the OCR text is needed, so skip the rest of the document
+            doc = await self._make_request(
+                f"/api/documents/{document_id}/",
+                params={"fields": "content"},
+                cache_ttl=_DOCUMENT_CACHE_TTL,
+                conditional=True,
+            )
             return doc.get("content", "")
         except Exception as e:
             print(f"Error retrieving content for document {document_id}: {e}")
             return None
+
+    async def _bulk_fetch_contents(self, ids: List[int]) -> Dict[int, str]:
+        """Retrieve the content of several documents with one listing request"""
+        results = await self._make_request(
+            "/api/documents/",
+            params={
+                "id__in": ",".join(map(str, ids)),
+                "page_size": len(ids),
+                "fields": "id,content",
+            },
+        )
+        return {doc["id"]: doc.get("content", "") for doc in results.get("results", [])}
+
+    async def _get_contents(
+        self, documents: List[Dict[str, Any]]
+    ) -> List[Optional[str]]:
+        """Content of listed documents, fetching only what the listing left out"""
+        contents = [doc.get("content") for doc in documents]
+        missing = [
+            doc["id"] for doc, content in zip(documents, contents) if content is None
+        ]
+        if not missing:
+            return contents
+
+        try:
+            fetched = await self._bulk_fetch_contents(missing)
+        except Exception:
+            fetched = {}
+        # Anything the bulk request didn't return is fetched one by one
+        unfetched = [doc_id for doc_id in missing if doc_id not in fetched]
+        if unfetched:
+            fallback = await asyncio.gather(
+                *(self._get_document_content(doc_id) for doc_id in unfetched)
+            )
+            fetched.update(zip(unfetched, fallback))
+        return [
+            fetched.get(doc["id"]) if content is None else content
+            for doc, content in zip(documents, contents)
+        ]
         
+    async def _get_reference(
+        self, endpoint: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Fetch every page of a tag, correspondent or document type listing"""
+        ttl = self.valves.cache_ttl_seconds
+        results = await self._make_request(endpoint, params=params, cache_ttl=ttl)
+        if not results.get("next"):
+            return results
+
+        # More than one page_size worth of entries; follow the next links
+        items = list(results.get("results", []))
+        page = 1
+        while results.get("next") and len(items) < _MAX_REFERENCE_ITEMS:
+            page += 1
+            results = await self._make_request(
+                endpoint, params={**params, "page": page}, cache_ttl=ttl
+            )
+            items.extend(results.get("results", []))
+        return {"count": len(items), "results": items[:_MAX_REFERENCE_ITEMS]}
+
+    async def _get_name_index(
+        self, endpoint: str, params: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """Map lowercased names to IDs for tags, correspondents or document types"""
+        cached = self._name_indexes.get(endpoint)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        results = await self._get_reference(endpoint, params)
+        # Built in reverse so the first of several case-insensitive matches wins
+        index = {
+            item.get("name", "").lower(): str(item["id"])
+            for item in reversed(results.get("results", []))
+        }
+        expires_at = time.monotonic() + self.valves.cache_ttl_seconds
+        self._name_indexes[endpoint] = (expires_at, index)
+        return index
+
+    async def _resolve_ids(
+        self, names: List[str], endpoint: str, params: Dict[str, Any]
+    ) -> List[Optional[str]]:
+        """Resolve names or numeric IDs to IDs, with None for unknown names"""
+        numeric = [name.isdigit() for name in names]
+        if all(numeric):
+            return list(names)
+        index = await self._get_name_index(endpoint, params)
+        return [
+            name if is_id else index.get(name.lower())
+            for name, is_id in zip(names, numeric)
+        ]
+
     async def list_all_tags(
         self,
         __user__: dict = {},
@@ -696,17 +925,12 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
         
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__({
-                "type": "status",
-                "data": {
-                    "description": "Retrieving all tags from Paperless...",
-                    "done": False
-                }
-            })
+        await self._emit_status(
+            __event_emitter__, "Retrieving all tags from Paperless..."
+        )
         
         try:
-            results = self._make_request('/api/tags/', params={'page_size': 1000})
+            results = await self._get_reference('/api/tags/', _TAG_PARAMS)
             
             if not results.get('results'):
                 return "No tags found in your Paperless instance."
@@ -715,33 +939,13 @@ class Tools:
             
             output_parts = [f"# Available Tags ({len(tags)} total)\n\n"]
             
-            # Sort by document count (descending) then by name
-            tags_sorted = sorted(
-                tags,
-                key=lambda t: (-t.get('document_count', 0), t.get('name', '').lower())
-            )
-            
-            for tag in tags_sorted:
-                tag_id = tag['id']
-                tag_name = tag.get('name', 'Unnamed')
-                doc_count = tag.get('document_count', 0)
+            for tag in tags:
                 color = tag.get('color', '')
-                
-                output_parts.append(f"- **{tag_name}** (ID: {tag_id})")
-                output_parts.append(f" - {doc_count} document{'s' if doc_count != 1 else ''}")
-                if color:
-                    output_parts.append(f" - Color: {color}")
-                output_parts.append("\n")
+                output_parts.append(_count_entry(tag, f" - Color: {color}" if color else ""))
             
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {
-                        "description": "Tags retrieved successfully",
-                        "done": True,
-                        "hidden": True
-                    }
-                })
+            await self._emit_status(
+                __event_emitter__, "Tags retrieved successfully", done=True, hidden=True
+            )
             
             return "".join(output_parts)
             
@@ -775,121 +979,108 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
         
-        user_valves = __user__.get("valves", self.UserValves())
-        if not isinstance(user_valves, self.UserValves):
-            user_valves = self.UserValves(**dict(user_valves))
+        user_valves = self._resolve_user_valves(__user__)
         
         # Parse tags input
         tag_list = [t.strip() for t in tags.split(',') if t.strip()]
         if not tag_list:
             return "No tags specified. Please provide tag names or IDs."
         
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__({
-                "type": "status",
-                "data": {
-                    "description": f"Searching for documents with tags: {', '.join(tag_list)}",
-                    "done": False
-                }
-            })
+        await self._emit_status(
+            __event_emitter__,
+            f"Searching for documents with tags: {', '.join(tag_list)}",
+        )
         
         try:
-            # First, resolve tag names to IDs if needed
-            tag_ids = []
-            all_tags = self._make_request('/api/tags/', params={'page_size': 1000})
-            
-            for tag_input in tag_list:
-                # Check if it's already a numeric ID
-                if tag_input.isdigit():
-                    tag_ids.append(tag_input)
-                else:
-                    # Search for tag by name (case-insensitive)
-                    matching_tag = None
-                    for tag in all_tags.get('results', []):
-                        if tag.get('name', '').lower() == tag_input.lower():
-                            matching_tag = tag
-                            break
-                    
-                    if matching_tag:
-                        tag_ids.append(str(matching_tag['id']))
-                    else:
-                        return f"Tag not found: '{tag_input}'. Use list_all_tags to see available tags."
-            
-            if not tag_ids:
-                return "No valid tags found."
-            
             # Build search parameters
-            params = {'page_size': min(user_valves.max_results, 25)}
+            params = {
+                'page_size': min(user_valves.max_results, 25),
+                'fields': self._document_fields(user_valves)
+            }
+            match_desc = "all tags" if match_all else "any of these tags"
             
-            if match_all:
-                # For match_all, use tags__id__all
-                params['tags__id__all'] = ','.join(tag_ids)
-                match_desc = "all tags"
+            if len(tag_list) == 1 and not tag_list[0].isdigit():
+                # A single name can be matched by Paperless directly
+                params['tags__name__iexact'] = tag_list[0]
             else:
-                # For match_any, use tags__id__in
-                params['tags__id__in'] = ','.join(tag_ids)
-                match_desc = "any of these tags"
+                # Otherwise resolve tag names to IDs (case-insensitive)
+                tag_ids = await self._resolve_ids(tag_list, '/api/tags/', _TAG_PARAMS)
+                
+                for tag_input, tag_id in zip(tag_list, tag_ids):
+                    if tag_id is None:
+                        return f"Tag not found: '{tag_input}'. Use list_all_tags to see available tags."
+                
+                # Sorted so the same tags in any order share a cache entry
+                tag_filter = ','.join(sorted(set(tag_ids), key=int))
+                if match_all:
+                    # For match_all, use tags__id__all
+                    params['tags__id__all'] = tag_filter
+                else:
+                    # For match_any, use tags__id__in
+                    params['tags__id__in'] = tag_filter
             
-            # Search for documents
-            results = self._make_request('/api/documents/', params=params)
+            # Search for documents; follow-up questions often repeat the search
+            results = await self._make_request('/api/documents/', params=params, cache_ttl=_DOCUMENT_CACHE_TTL)
             
             if not results.get('results'):
+                if 'tags__name__iexact' in params:
+                    # Tell an unknown tag apart from one with no documents
+                    index = await self._get_name_index('/api/tags/', _TAG_PARAMS)
+                    if tag_list[0].lower() not in index:
+                        return f"Tag not found: '{tag_list[0]}'. Use list_all_tags to see available tags."
                 return f"No documents found with {match_desc}: {', '.join(tag_list)}"
             
             documents = results['results']
             total_count = results.get('count', len(documents))
             
             # Format results
-            output_parts = [f"# Documents with {match_desc}: {', '.join(tag_list)}\n\n"]
-            output_parts.append(f"Found {total_count} documents, showing top {len(documents)}:\n\n")
-            output_parts.append("---\n\n")
+            output = io.StringIO()
+            output.write(f"# Documents with {match_desc}: {', '.join(tag_list)}\n\n")
+            output.write(f"Found {total_count} documents, showing top {len(documents)}:\n\n")
+            output.write(_SEP)
             
-            for idx, doc in enumerate(documents, 1):
+            # Retrieve full content concurrently if requested
+            include_content = user_valves.include_content
+            max_size = self.valves.max_document_size
+            contents = [None] * len(documents)
+            if include_content:
+                contents = await self._get_contents(documents)
+            
+            citations = []
+            for idx, (doc, content) in enumerate(zip(documents, contents), 1):
                 doc_id = doc['id']
                 
                 doc_output = self._format_document(doc, idx, user_valves)
-                output_parts.append(doc_output)
+                output.write(doc_output)
                 
-                # Retrieve full content if requested
-                if user_valves.include_content:
-                    content = self._get_document_content(doc_id)
-                    if content:
-                        if len(content) > self.valves.max_document_size:
-                            content = content[:self.valves.max_document_size] + "\n\n[Content truncated...]"
-                        output_parts.append(f"\n**Content:**\n\n{content}\n\n")
+                if content:
+                    if len(content) > max_size:
+                        content = content[:max_size] + "\n\n[Content truncated...]"
+                    output.write(f"\n**Content:**\n\n{content}\n\n")
                 
                 # Emit citation
                 if __event_emitter__:
-                    doc_url = urljoin(self.valves.paperless_url, f"/documents/{doc_id}")
-                    await __event_emitter__({
-                        "type": "citation",
-                        "data": {
-                            "document": [doc_output + (f"\n\n{content}" if user_valves.include_content and content else "")],
-                            "metadata": [{
-                                "document_id": doc_id,
-                                "title": doc.get('title'),
-                                "tags": [t.get('name') for t in doc.get('tags', []) if isinstance(t, dict)]
-                            }],
-                            "source": {
-                                "name": f"#{doc_id}: {doc.get('title', 'Untitled')}",
-                                "url": doc_url
-                            }
-                        }
-                    })
+                    body = f"{doc_output}\n\n{content}" if content else doc_output
+                    metadata = {
+                        "document_id": doc_id,
+                        "title": doc.get('title'),
+                        "tags": [t.get('name') for t in doc.get('tags', ()) if isinstance(t, dict)]
+                    }
+                    title = doc.get('title', 'Untitled')
+                    citations.append(__event_emitter__(self._citation(doc_id, title, body, metadata)))
                 
-                output_parts.append("---\n\n")
+                output.write(_SEP)
             
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {
-                        "description": f"Found {len(documents)} documents",
-                        "done": True,
-                        "hidden": True
-                    }
-                })
+            await asyncio.gather(*citations, return_exceptions=True)
             
-            return "".join(output_parts)
+            await self._emit_status(
+                __event_emitter__,
+                f"Found {len(documents)} documents",
+                done=True,
+                hidden=True,
+            )
+            
+            return output.getvalue()
             
         except Exception as e:
             return f"Error searching by tags: {str(e)}"
@@ -910,17 +1101,10 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
         
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__({
-                "type": "status",
-                "data": {
-                    "description": "Retrieving correspondents...",
-                    "done": False
-                }
-            })
+        await self._emit_status(__event_emitter__, "Retrieving correspondents...")
         
         try:
-            results = self._make_request('/api/correspondents/', params={'page_size': 1000})
+            results = await self._get_reference('/api/correspondents/', _NAMED_PARAMS)
             
             if not results.get('results'):
                 return "No correspondents found in your Paperless instance."
@@ -929,29 +1113,11 @@ class Tools:
             
             output_parts = [f"# Available Correspondents ({len(correspondents)} total)\n\n"]
             
-            # Sort by document count (descending) then by name
-            correspondents_sorted = sorted(
-                correspondents,
-                key=lambda c: (-c.get('document_count', 0), c.get('name', '').lower())
-            )
+            output_parts.extend(map(_count_entry, correspondents))
             
-            for corr in correspondents_sorted:
-                corr_id = corr['id']
-                corr_name = corr.get('name', 'Unnamed')
-                doc_count = corr.get('document_count', 0)
-                
-                output_parts.append(f"- **{corr_name}** (ID: {corr_id})")
-                output_parts.append(f" - {doc_count} document{'s' if doc_count != 1 else ''}\n")
-            
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {
-                        "description": "Correspondents retrieved",
-                        "done": True,
-                        "hidden": True
-                    }
-                })
+            await self._emit_status(
+                __event_emitter__, "Correspondents retrieved", done=True, hidden=True
+            )
             
             return "".join(output_parts)
             
@@ -975,17 +1141,10 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
         
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__({
-                "type": "status",
-                "data": {
-                    "description": "Retrieving document types...",
-                    "done": False
-                }
-            })
+        await self._emit_status(__event_emitter__, "Retrieving document types...")
         
         try:
-            results = self._make_request('/api/document_types/', params={'page_size': 1000})
+            results = await self._get_reference('/api/document_types/', _NAMED_PARAMS)
             
             if not results.get('results'):
                 return "No document types found in your Paperless instance."
@@ -994,29 +1153,11 @@ class Tools:
             
             output_parts = [f"# Available Document Types ({len(doc_types)} total)\n\n"]
             
-            # Sort by document count (descending) then by name
-            doc_types_sorted = sorted(
-                doc_types,
-                key=lambda dt: (-dt.get('document_count', 0), dt.get('name', '').lower())
-            )
-            
-            for doc_type in doc_types_sorted:
-                type_id = doc_type['id']
-                type_name = doc_type.get('name', 'Unnamed')
-                doc_count = doc_type.get('document_count', 0)
-                
-                output_parts.append(f"- **{type_name}** (ID: {type_id})")
-                output_parts.append(f" - {doc_count} document{'s' if doc_count != 1 else ''}\n")
+            output_parts.extend(map(_count_entry, doc_types))
             
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {
-                        "description": "Document types retrieved",
-                        "done": True,
-                        "hidden": True
-                    }
-                })
+            await self._emit_status(
+                __event_emitter__, "Document types retrieved", done=True, hidden=True
+            )
             
             return "".join(output_parts)
             
@@ -1060,45 +1201,22 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
         
-        user_valves = __user__.get("valves", self.UserValves())
-        if not isinstance(user_valves, self.UserValves):
-            user_valves = self.UserValves(**dict(user_valves))
+        user_valves = self._resolve_user_valves(__user__)
         
         # Resolve document type to ID
-        doc_type_id = None
-        if document_type.isdigit():
-            doc_type_id = document_type
-        else:
-            # Search for document type by name
-            all_types = self._make_request('/api/document_types/', params={'page_size': 1000})
-            for dt in all_types.get('results', []):
-                if dt.get('name', '').lower() == document_type.lower():
-                    doc_type_id = str(dt['id'])
-                    break
-            
-            if not doc_type_id:
-                return f"Document type not found: '{document_type}'. Use list_document_types to see available types."
+        [doc_type_id] = await self._resolve_ids([document_type], '/api/document_types/', _NAMED_PARAMS)
+        if not doc_type_id:
+            return f"Document type not found: '{document_type}'. Use list_document_types to see available types."
         
         # Resolve tags to IDs if provided
         tag_ids = []
         if tags:
             tag_list = [t.strip() for t in tags.split(',') if t.strip()]
-            all_tags = self._make_request('/api/tags/', params={'page_size': 1000})
+            tag_ids = await self._resolve_ids(tag_list, '/api/tags/', _TAG_PARAMS)
             
-            for tag_input in tag_list:
-                if tag_input.isdigit():
-                    tag_ids.append(tag_input)
-                else:
-                    matching_tag = None
-                    for tag in all_tags.get('results', []):
-                        if tag.get('name', '').lower() == tag_input.lower():
-                            matching_tag = tag
-                            break
-                    
-                    if matching_tag:
-                        tag_ids.append(str(matching_tag['id']))
-                    else:
-                        return f"Tag not found: '{tag_input}'. Use list_all_tags to see available tags."
+            for tag_input, tag_id in zip(tag_list, tag_ids):
+                if tag_id is None:
+                    return f"Tag not found: '{tag_input}'. Use list_all_tags to see available tags."
         
         # Build search description
         search_desc_parts = [f"type '{document_type}'"]
@@ -1109,19 +1227,15 @@ class Tools:
             search_desc_parts.append(f"matching '{query}'")
         search_description = " ".join(search_desc_parts)
         
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__({
-                "type": "status",
-                "data": {
-                    "description": f"Searching for documents with {search_description}",
-                    "done": False
-                }
-            })
+        await self._emit_status(
+            __event_emitter__, f"Searching for documents with {search_description}"
+        )
         
         try:
             # Build search parameters
             params = {
                 'page_size': min(user_valves.max_results, 25),
+                'fields': self._document_fields(user_valves),
                 'document_type__id': doc_type_id
             }
             
@@ -1137,7 +1251,7 @@ class Tools:
                 params['query'] = query
             
             # Execute search
-            results = self._make_request('/api/documents/', params=params)
+            results = await self._make_request('/api/documents/', params=params)
             
             if not results.get('results'):
                 return f"No documents found with {search_description}"
@@ -1146,57 +1260,54 @@ class Tools:
             total_count = results.get('count', len(documents))
             
             # Format results
-            output_parts = [f"# Documents with {search_description}\n\n"]
-            output_parts.append(f"Found {total_count} documents, showing top {len(documents)}:\n\n")
-            output_parts.append("---\n\n")
+            output = io.StringIO()
+            output.write(f"# Documents with {search_description}\n\n")
+            output.write(f"Found {total_count} documents, showing top {len(documents)}:\n\n")
+            output.write(_SEP)
             
-            for idx, doc in enumerate(documents, 1):
+            # Retrieve full content concurrently if requested
+            include_content = user_valves.include_content
+            max_size = self.valves.max_document_size
+            contents = [None] * len(documents)
+            if include_content:
+                contents = await self._get_contents(documents)
+            
+            citations = []
+            for idx, (doc, content) in enumerate(zip(documents, contents), 1):
                 doc_id = doc['id']
                 
                 doc_output = self._format_document(doc, idx, user_valves)
-                output_parts.append(doc_output)
+                output.write(doc_output)
                 
-                # Retrieve full content if requested
-                if user_valves.include_content:
-                    content = self._get_document_content(doc_id)
-                    if content:
-                        if len(content) > self.valves.max_document_size:
-                            content = content[:self.valves.max_document_size] + "\n\n[Content truncated...]"
-                        output_parts.append(f"\n**Content:**\n\n{content}\n\n")
+                if content:
+                    if len(content) > max_size:
+                        content = content[:max_size] + "\n\n[Content truncated...]"
+                    output.write(f"\n**Content:**\n\n{content}\n\n")
                 
                 # Emit citation
                 if __event_emitter__:
-                    doc_url = urljoin(self.valves.paperless_url, f"/documents/{doc_id}")
-                    await __event_emitter__({
-                        "type": "citation",
-                        "data": {
-                            "document": [doc_output + (f"\n\n{content}" if user_valves.include_content and content else "")],
-                            "metadata": [{
-                                "document_id": doc_id,
-                                "title": doc.get('title'),
-                                "document_type": document_type,
-                                "tags": [t.get('name') for t in doc.get('tags', []) if isinstance(t, dict)]
-                            }],
-                            "source": {
-                                "name": f"#{doc_id}: {doc.get('title', 'Untitled')}",
-                                "url": doc_url
-                            }
-                        }
-                    })
+                    body = f"{doc_output}\n\n{content}" if content else doc_output
+                    metadata = {
+                        "document_id": doc_id,
+                        "title": doc.get('title'),
+                        "document_type": document_type,
+                        "tags": [t.get('name') for t in doc.get('tags', ()) if isinstance(t, dict)]
+                    }
+                    title = doc.get('title', 'Untitled')
+                    citations.append(__event_emitter__(self._citation(doc_id, title, body, metadata)))
                 
-                output_parts.append("---\n\n")
+                output.write(_SEP)
             
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {
-                        "description": f"Found {len(documents)} documents",
-                        "done": True,
-                        "hidden": True
-                    }
-                })
+            await asyncio.gather(*citations, return_exceptions=True)
             
-            return "".join(output_parts)
+            await self._emit_status(
+                __event_emitter__,
+                f"Found {len(documents)} documents",
+                done=True,
+                hidden=True,
+            )
+            
+            return output.getvalue()
             
         except Exception as e:
             return f"Error searching documents: {str(e)}"
@@ -1238,27 +1349,17 @@ class Tools:
         if not self.valves.api_token:
             return "Paperless-ngx API token not configured."
         
-        user_valves = __user__.get("valves", self.UserValves())
-        if not isinstance(user_valves, self.UserValves):
-            user_valves = self.UserValves(**dict(user_valves))
+        user_valves = self._resolve_user_valves(__user__)
         
         # Resolve correspondent to ID
-        corr_id = None
-        if correspondent.isdigit():
-            corr_id = correspondent
-        else:
-            all_corrs = self._make_request('/api/correspondents/', params={'page_size': 1000})
-            for corr in all_corrs.get('results', []):
-                if corr.get('name', '').lower() == correspondent.lower():
-                    corr_id = str(corr['id'])
-                    break
-            
-            if not corr_id:
-                return f"Correspondent not found: '{correspondent}'. Use list_correspondents to see available correspondents."
+        [corr_id] = await self._resolve_ids([correspondent], '/api/correspondents/', _NAMED_PARAMS)
+        if not corr_id:
+            return f"Correspondent not found: '{correspondent}'. Use list_correspondents to see available correspondents."
         
         # Build search parameters
         params = {
             'page_size': min(user_valves.max_results, 25),
+            'fields': self._document_fields(user_valves),
             'correspondent__id': corr_id
         }
         
@@ -1266,33 +1367,15 @@ class Tools:
         
         # Add optional filters
         if document_type:
-            doc_type_id = None
-            if document_type.isdigit():
-                doc_type_id = document_type
-            else:
-                all_types = self._make_request('/api/document_types/', params={'page_size': 1000})
-                for dt in all_types.get('results', []):
-                    if dt.get('name', '').lower() == document_type.lower():
-                        doc_type_id = str(dt['id'])
-                        break
-            
+            [doc_type_id] = await self._resolve_ids([document_type], '/api/document_types/', _NAMED_PARAMS)
             if doc_type_id:
                 params['document_type__id'] = doc_type_id
                 search_desc += f", type '{document_type}'"
         
         if tags:
             tag_list = [t.strip() for t in tags.split(',') if t.strip()]
-            all_tags = self._make_request('/api/tags/', params={'page_size': 1000})
-            tag_ids = []
-            
-            for tag_input in tag_list:
-                if tag_input.isdigit():
-                    tag_ids.append(tag_input)
-                else:
-                    for tag in all_tags.get('results', []):
-                        if tag.get('name', '').lower() == tag_input.lower():
-                            tag_ids.append(str(tag['id']))
-                            break
+            resolved = await self._resolve_ids(tag_list, '/api/tags/', _TAG_PARAMS)
+            tag_ids = [tag_id for tag_id in resolved if tag_id]
             
             if tag_ids:
                 params['tags__id__in'] = ','.join(tag_ids)
@@ -1302,17 +1385,12 @@ class Tools:
             params['query'] = query
             search_desc += f", matching '{query}'"
         
-        if __event_emitter__ and self.valves.enable_status_updates:
-            await __event_emitter__({
-                "type": "status",
-                "data": {
-                    "description": f"Searching for documents from {search_desc}",
-                    "done": False
-                }
-            })
+        await self._emit_status(
+            __event_emitter__, f"Searching for documents from {search_desc}"
+        )
         
         try:
-            results = self._make_request('/api/documents/', params=params)
+            results = await self._make_request('/api/documents/', params=params)
             
             if not results.get('results'):
                 return f"No documents found from {search_desc}"
@@ -1320,36 +1398,36 @@ class Tools:
             documents = results['results']
             total_count = results.get('count', len(documents))
             
-            output_parts = [f"# Documents from {search_desc}\n\n"]
-            output_parts.append(f"Found {total_count} documents, showing top {len(documents)}:\n\n")
-            output_parts.append("---\n\n")
+            output = io.StringIO()
+            output.write(f"# Documents from {search_desc}\n\n")
+            output.write(f"Found {total_count} documents, showing top {len(documents)}:\n\n")
+            output.write(_SEP)
             
-            for idx, doc in enumerate(documents, 1):
+            # Retrieve full content concurrently if requested
+            include_content = user_valves.include_content
+            max_size = self.valves.max_document_size
+            contents = [None] * len(documents)
+            if include_content:
+                contents = await self._get_contents(documents)
+            
+            for idx, (doc, content) in enumerate(zip(documents, contents), 1):
                 doc_id = doc['id']
                 
                 doc_output = self._format_document(doc, idx, user_valves)
-                output_parts.append(doc_output)
+                output.write(doc_output)
                 
-                if user_valves.include_content:
-                    content = self._get_document_content(doc_id)
-                    if content:
-                        if len(content) > self.valves.max_document_size:
-                            content = content[:self.valves.max_document_size] + "\n\n[Content truncated...]"
-                        output_parts.append(f"\n**Content:**\n\n{content}\n\n")
+                if content:
+                    if len(content) > max_size:
+                        content = content[:max_size] + "\n\n[Content truncated...]"
+                    output.write(f"\n**Content:**\n\n{content}\n\n")
                 
-                output_parts.append("---\n\n")
+                output.write(_SEP)
             
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__({
-                    "type": "status",
-                    "data": {
-                        "description": "Search completed",
-                        "done": True,
-                        "hidden": True
-                    }
-                })
+            await self._emit_status(
+                __event_emitter__, "Search completed", done=True, hidden=True
+            )
             
-            return "".join(output_parts)
+            return output.getvalue()
             
         except Exception as e:
             return f"Error searching by correspondent: {str(e)}"
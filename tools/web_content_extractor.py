@@ -6,16 +6,63 @@ funding_url: https://github.com/sponsors/mplogas
 version: 1.0.0
 license: MIT
 description: Fetch and extract clean content from web URLs without external services. Supports multiple extraction methods and works entirely locally.
-requirements: trafilatura>=1.12.0,beautifulsoup4>=4.12.0,markdownify>=0.12.0,requests>=2.31.0,readability-lxml>=0.8.1
+requirements: trafilatura>=1.12.0,beautifulsoup4>=4.12.0,markdownify>=0.12.0,requests>=2.31.0,readability-lxml>=0.8.1,lxml>=4.9.0
 required_open_webui_version: 0.4.0
 """
 
+import asyncio
+import atexit
 import re
-from datetime import datetime
-from typing import Optional
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 from pydantic import BaseModel, Field
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_MAX_PARALLEL_FETCHES = 5
+_ALLOWED_SCHEMES = frozenset(("http", "https"))
+# Pages can be up to max_content_length each, so keep few of them
+_MAX_CACHED_PAGES = 32
+_MAX_CACHED_EXTRACTIONS = 128
+# Same cut-off readability uses before retrying less aggressively
+_MIN_CONTENT_LENGTH = 250
+_MARKUP_TYPES = ("html", "xml")
+_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+# markdownify keeps the text of stripped tags, so stripping <a> drops just links
+_STRIP_TAGS = ["script", "style"]
+_STRIP_TAGS_NO_LINKS = _STRIP_TAGS + ["a"]
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_CONTENT_CLASS_RE = re.compile(r"content|main|article|post", re.I)
+_BOILERPLATE_TAGS = (
+    "script",
+    "style",
+    "nav",
+    "footer",
+    "header",
+    "aside",
+    "noscript",
+    "iframe",
+)
+_BOILERPLATE_XPATH = "|".join(f"//{tag}" for tag in _BOILERPLATE_TAGS)
+# Same precedence as the BeautifulSoup lookups: first match of each, in order
+_MAIN_CONTENT_XPATHS = (
+    "//main",
+    "//article",
+    f'//div[re:test(@class, "{_CONTENT_CLASS_RE.pattern}", "i")]',
+    "//body",
+)
+_XPATH_NAMESPACES = {"re": "http://exslt.org/regular-expressions"}
+# Navigation, cookie banners and ad slots, dropped before trafilatura and
+# readability score the page; the page containers themselves are never dropped
+_PRESTRIP_CLASS_RE = re.compile(r"cookie|(^|\s)(ads?|advert\w*|ad-\S+)(\s|$)", re.I)
+_PRESTRIP_XPATH = (
+    '//nav|//aside|//*[@role="navigation"]'
+    "|//*[not(self::html or self::body or self::main or self::article)]"
+    f'[re:test(concat(@class, " ", @id), "{_PRESTRIP_CLASS_RE.pattern}", "i")]'
+)
 
 
 class Tools:
@@ -24,14 +71,54 @@ class Tools:
         self.valves = self.Valves()
         self.citation = False  # We'll handle citations manually
 
+        # One pooled session keeps connections alive across fetches to a host
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=_MAX_PARALLEL_FETCHES,
+            max_retries=Retry(
+                total=2,
+                # Re-raise read timeouts as-is so they surface as Timeout, not as
+                # a retried ConnectionError ("Max retries exceeded")
+                read=False,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                # Any site could otherwise hold a fetch for hours via Retry-After
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        atexit.register(self._session.close)
+
+        # Pages with validators are revalidated with a conditional GET, and
+        # unchanged pages reuse their extraction instead of parsing again
+        self._pages: Dict[str, Tuple[Optional[str], Optional[str], str]] = {}
+        self._pages_lock = threading.Lock()
+        self._extractions: Dict[tuple, Tuple[str, dict]] = {}
+
         # Check for available extraction libraries
+        self.has_resiliparse = False
         self.has_trafilatura = False
         self.has_readability = False
 
+        try:
+            from resiliparse.extract.html2text import extract_plain_text
+            from resiliparse.parse.html import HTMLTree
+
+            self.extract_plain_text = extract_plain_text
+            self.HTMLTree = HTMLTree
+            self.has_resiliparse = True
+        except ImportError:
+            pass
+
         try:
             import trafilatura
+            from trafilatura.utils import load_html
 
             self.trafilatura = trafilatura
+            self.load_html = load_html
             self.has_trafilatura = True
         except ImportError:
             pass
@@ -57,6 +144,16 @@ class Tools:
                 "Add to requirements: beautifulsoup4, markdownify, requests"
             )
 
+        # lxml parses far faster than the pure-Python html.parser
+        try:
+            import lxml.html
+
+            self.lxml_html = lxml.html
+            self.html_parser = "lxml"
+        except ImportError:
+            self.lxml_html = None
+            self.html_parser = "html.parser"
+
     class Valves(BaseModel):
         """Admin-configurable settings"""
 
@@ -80,7 +177,7 @@ class Tools:
 
         preferred_method: str = Field(
             default="auto",
-            description="Preferred extraction method: auto, trafilatura, readability, or basic",
+            description="Preferred extraction method: auto, resiliparse, trafilatura, readability, or basic",
         )
         include_links: bool = Field(
             default=True, description="Include links in extracted content"
@@ -127,30 +224,18 @@ class Tools:
                 }
             )
 
-        # Validate URL
+        # Validate URL; only web pages, never file:// or other local schemes
         try:
             parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                return "❌ Invalid URL format. Please provide a complete URL (e.g., https://example.com)"
-        except Exception as e:
+        except ValueError as e:
+            # e.g. a malformed IPv6 host
             return f"❌ Invalid URL: {str(e)}"
+        if parsed.scheme not in _ALLOWED_SCHEMES or not parsed.netloc:
+            return "❌ Invalid URL format. Please provide a complete http(s) URL (e.g., https://example.com)"
 
-        # Fetch content
+        # Fetch content off the event loop so other tool calls keep running
         try:
-            headers = {"User-Agent": self.valves.user_agent}
-
-            response = requests.get(
-                url, headers=headers, timeout=self.valves.default_timeout, stream=True
-            )
-            response.raise_for_status()
-
-            # Check content length
-            content_length = response.headers.get("content-length")
-            if content_length and int(content_length) > self.valves.max_content_length:
-                return f"Content too large ({content_length} bytes). Maximum: {self.valves.max_content_length}"
-
-            html_content = response.text
-
+            html_content = await asyncio.to_thread(self._download, url)
         except requests.exceptions.Timeout:
             if __event_emitter__ and self.valves.enable_status_updates:
                 await __event_emitter__(
@@ -171,6 +256,10 @@ class Tools:
                 )
             return f"Error fetching URL: {str(e)}"
 
+        except ValueError as e:
+            # Raised by _download when the page is too large or not HTML
+            return str(e)
+
         # Extract content
         if __event_emitter__ and self.valves.enable_status_updates:
             await __event_emitter__(
@@ -183,42 +272,43 @@ class Tools:
                 }
             )
 
-        content = None
-        metadata = {}
+        extraction_key = (url, hash(html_content), method, include_links)
+        extracted = self._extractions.get(extraction_key)
 
-        if method == "auto":
-            # Try trafilatura first
-            if self.has_trafilatura:
-                content, metadata = self._extract_with_trafilatura(
-                    html_content, url, include_links
-                )
+        # Parsing is CPU-bound, so it runs in a worker thread like the download
+        if extracted:
+            content, metadata = extracted
 
-            # Try readability if trafilatura failed
-            if not content and self.has_readability:
-                content, metadata = self._extract_with_readability(
-                    html_content, include_links
-                )
+        elif method == "auto":
+            content, metadata = await asyncio.to_thread(
+                self._extract_auto, html_content, url, include_links
+            )
 
-            # Fall back to basic
-            if not content:
-                content, metadata = self._extract_basic(html_content, include_links)
+        elif method == "resiliparse":
+            if not self.has_resiliparse:
+                return "Resiliparse not available. Change method to 'auto' or 'basic' in user settings."
+            content, metadata = await asyncio.to_thread(
+                self._extract_with_resiliparse, html_content, include_links
+            )
 
         elif method == "trafilatura":
             if not self.has_trafilatura:
                 return "Trafilatura not available. Change method to 'auto' or 'basic' in user settings."
-            content, metadata = self._extract_with_trafilatura(
-                html_content, url, include_links
+            content, metadata = await asyncio.to_thread(
+                self._extract_with_trafilatura, html_content, url, include_links
             )
 
         elif method == "readability":
             if not self.has_readability:
                 return "Readability not available. Change method to 'auto' or 'basic' in user settings."
-            content, metadata = self._extract_with_readability(
-                html_content, include_links
+            content, metadata = await asyncio.to_thread(
+                self._extract_with_readability, html_content, include_links
             )
 
         elif method == "basic":
-            content, metadata = self._extract_basic(html_content, include_links)
+            content, metadata = await asyncio.to_thread(
+                self._extract_basic, html_content, include_links
+            )
 
         else:
             return f"Unknown extraction method: {method}"
@@ -226,6 +316,11 @@ class Tools:
         if not content:
             return "Could not extract content from the page"
 
+        if not extracted:
+            if len(self._extractions) >= _MAX_CACHED_EXTRACTIONS:
+                self._extractions.pop(next(iter(self._extractions)))
+            self._extractions[extraction_key] = (content, metadata)
+
         # Emit citation
         if __event_emitter__:
             citation_data = {
@@ -233,7 +328,7 @@ class Tools:
                 "metadata": [
                     {
                         "source": url,
-                        "date_accessed": datetime.now().isoformat(),
+                        "date_accessed": datetime.now(timezone.utc).isoformat(),
                     }
                 ],
                 "source": {"name": metadata.get("title", url), "url": url},
@@ -260,20 +355,17 @@ class Tools:
             )
 
         # Format output
-        output_parts = []
-
-        if show_metadata:
-            output_parts.append(f"# {metadata.get('title', 'Web Content')}\n")
-            output_parts.append(f"**Source:** {url}\n")
-            if metadata.get("author"):
-                output_parts.append(f"**Author:** {metadata['author']}\n")
-            if metadata.get("date"):
-                output_parts.append(f"**Date:** {metadata['date']}\n")
-            output_parts.append("\n---\n\n")
-
-        output_parts.append(content)
-
-        return "".join(output_parts)
+        if not show_metadata:
+            return content
+
+        author = metadata.get("author")
+        author_line = f"**Author:** {author}\n" if author else ""
+        date = metadata.get("date")
+        date_line = f"**Date:** {date}\n" if date else ""
+        return (
+            f"# {metadata.get('title', 'Web Content')}\n**Source:** {url}\n"
+            f"{author_line}{date_line}\n---\n\n{content}"
+        )
 
     async def fetch_multiple_urls(
         self,
@@ -293,7 +385,9 @@ class Tools:
         :return: Combined extracted content from all URLs
         """
 
-        url_list = [url.strip() for url in urls.split(",") if url.strip()]
+        # Repeats, including ones differing only by #fragment, are fetched once
+        candidates = (url.strip().partition("#")[0] for url in urls.split(","))
+        url_list = list(dict.fromkeys(url for url in candidates if url))
 
         if not url_list:
             return "No valid URLs provided. Please provide comma-separated URLs."
@@ -309,26 +403,29 @@ class Tools:
                 }
             )
 
-        results = []
-        for i, url in enumerate(url_list, 1):
-            if __event_emitter__ and self.valves.enable_status_updates:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": f"Processing URL {i}/{len(url_list)}: {url}",
-                            "done": False,
-                        },
-                    }
+        # Pages are fetched concurrently, a few at a time
+        semaphore = asyncio.Semaphore(_MAX_PARALLEL_FETCHES)
+
+        async def fetch(i: int, url: str) -> str:
+            async with semaphore:
+                if __event_emitter__ and self.valves.enable_status_updates:
+                    await __event_emitter__(
+                        {
+                            "type": "status",
+                            "data": {
+                                "description": f"Processing URL {i}/{len(url_list)}: {url}",
+                                "done": False,
+                            },
+                        }
+                    )
+
+                return await self.fetch_url_content(
+                    url=url, __user__=__user__, __event_emitter__=__event_emitter__
                 )
 
-            content = await self.fetch_url_content(
-                url=url, __user__=__user__, __event_emitter__=__event_emitter__
-            )
-            results.append(content)
-
-            if i < len(url_list):
-                results.append("\n\n---\n\n")
+        results = await asyncio.gather(
+            *(fetch(i, url) for i, url in enumerate(url_list, 1))
+        )
 
         if __event_emitter__ and self.valves.enable_status_updates:
             await __event_emitter__(
@@ -342,31 +439,161 @@ class Tools:
                 }
             )
 
-        return "".join(results)
+        return "\n\n---\n\n".join(results)
+
+    def _download(self, url: str) -> str:
+        """Fetch and decode an HTML page no larger than max_content_length"""
+        headers = {"User-Agent": self.valves.user_agent, "Accept": _ACCEPT}
+        max_length = self.valves.max_content_length
+
+        cached = self._pages.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = self._session.get(
+            url, headers=headers, timeout=self.valves.default_timeout, stream=True
+        )
+        with response:
+            if cached and response.status_code == 304:
+                return cached[2]
+            response.raise_for_status()
+
+            # PDFs, images and other binaries would only fail extraction later
+            content_type = response.headers.get("content-type", "").lower()
+            if content_type and not any(
+                kind in content_type for kind in _MARKUP_TYPES
+            ):
+                raise ValueError(f"Unsupported content type: {content_type}")
+
+            # Check content length
+            content_length = response.headers.get("content-length")
+            if content_length and int(content_length) > max_length:
+                raise ValueError(
+                    f"Content too large ({content_length} bytes). Maximum: {max_length}"
+                )
+
+            # Servers often omit Content-Length, so enforce the cap while reading
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body += chunk
+                if len(body) > max_length:
+                    raise ValueError(
+                        f"Content too large (over {max_length} bytes). Maximum: {max_length}"
+                    )
+
+            # apparent_encoding would need the already-consumed response.content
+            try:
+                html = body.decode(response.encoding or "utf-8", "replace")
+            except LookupError:
+                html = body.decode("utf-8", "replace")
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            # Downloads run in worker threads, so guard the shared dict
+            with self._pages_lock:
+                if len(self._pages) >= _MAX_CACHED_PAGES:
+                    self._pages.pop(next(iter(self._pages)), None)
+                self._pages[url] = (etag, last_modified, html)
+        return html
+
+    def _extract_auto(
+        self, html: str, url: str, include_links: bool
+    ) -> tuple[Optional[str], dict]:
+        """Try each available extractor in turn until one returns enough content"""
+        # Resiliparse first, it is several times faster than the rest
+        extractors = []
+        if self.has_resiliparse:
+            extractors.append(
+                lambda: self._extract_with_resiliparse(html, include_links)
+            )
+        if self.has_trafilatura:
+            extractors.append(
+                lambda: self._extract_with_trafilatura(html, url, include_links)
+            )
+        if self.has_readability:
+            extractors.append(
+                lambda: self._extract_with_readability(html, include_links)
+            )
+
+        best_content, best_metadata = None, {}
+        for extract in extractors:
+            content, metadata = extract()
+            if content and len(content) >= _MIN_CONTENT_LENGTH:
+                return content, metadata
+            # A short result is often a teaser or cookie notice; keep looking
+            if content and len(content) > len(best_content or ""):
+                best_content, best_metadata = content, metadata
+
+        if best_content:
+            return best_content, best_metadata
+
+        # Fall back to basic
+        return self._extract_basic(html, include_links)
+
+    def _extract_with_resiliparse(
+        self, html: str, include_links: bool
+    ) -> tuple[Optional[str], dict]:
+        """Extract content using resiliparse"""
+        try:
+            tree = self.HTMLTree.parse(html)
+
+            # Extract metadata
+            metadata = {"title": tree.title or "", "author": "", "date": ""}
+            if tree.head:
+                author_tag = tree.head.query_selector('meta[name="author"]')
+                if author_tag:
+                    metadata["author"] = author_tag.getattr("content", "")
+
+            content = self.extract_plain_text(
+                tree,
+                preserve_formatting=True,
+                main_content=True,
+                list_bullets=True,
+                links=include_links,
+            )
+            return content.strip() or None, metadata
+
+        except Exception as e:
+            print(f"Resiliparse extraction failed: {e}")
+            return None, {}
 
     def _extract_with_trafilatura(
         self, html: str, url: str, include_links: bool
     ) -> tuple[Optional[str], dict]:
         """Extract content using trafilatura"""
         try:
+            # Parse once for both calls; metadata goes first because
+            # extraction may prune the tree it is given
+            tree = self.load_html(html)
+            if tree is None:
+                return None, {}
+
+            # Extract metadata
+            metadata_obj = self.trafilatura.extract_metadata(tree)
+            metadata = {}
+            if metadata_obj:
+                metadata["title"] = metadata_obj.title or ""
+                metadata["author"] = metadata_obj.author or ""
+                metadata["date"] = metadata_obj.date or ""
+
+            self._prestrip_boilerplate(tree)
             content = self.trafilatura.extract(
-                html,
+                tree,
                 output_format="markdown",
                 include_links=include_links,
                 include_images=True,
                 include_tables=True,
                 url=url,
                 with_metadata=True,
+                # The auto chain already falls back to readability on its own
+                no_fallback=True,
             )
 
-            # Extract metadata
-            metadata_obj = self.trafilatura.extract_metadata(html)
-            metadata = {}
-            if metadata_obj:
-                metadata["title"] = metadata_obj.title or ""
-                metadata["author"] = metadata_obj.author or ""
-                metadata["date"] = metadata_obj.date or ""
-
             return content, metadata
 
         except Exception as e:
@@ -378,22 +605,20 @@ class Tools:
     ) -> tuple[Optional[str], dict]:
         """Extract content using readability"""
         try:
-            doc = self.Document(html)
+            # readability accepts a tree and copies it before cleaning
+            try:
+                tree = self.lxml_html.document_fromstring(html)
+                self._prestrip_boilerplate(tree)
+            except (ValueError, self.lxml_html.etree.ParserError):
+                tree = html
+            doc = self.Document(tree)
             readable_html = doc.summary()
 
             # Extract metadata
             metadata = {"title": doc.title() or "", "author": "", "date": ""}
 
             # Convert to markdown
-            markdown = self.markdownify.markdownify(
-                readable_html,
-                heading_style="ATX",
-                bullets="-",
-                strip=["script", "style"],
-            )
-
-            if not include_links:
-                markdown = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", markdown)
+            markdown = self._to_markdown(readable_html, include_links)
 
             return markdown, metadata
 
@@ -401,61 +626,40 @@ class Tools:
             print(f"Readability extraction failed: {e}")
             return None, {}
 
+    def _prestrip_boilerplate(self, tree) -> None:
+        """Drop navigation, cookie and ad elements, keeping the text after them"""
+        for element in tree.xpath(_PRESTRIP_XPATH, namespaces=_XPATH_NAMESPACES):
+            element.drop_tree()
+
+    def _to_markdown(self, html: str, include_links: bool) -> str:
+        """Convert an HTML fragment to markdown"""
+        # markdownify() would re-parse with html.parser; lxml is about twice as fast
+        soup = self.BeautifulSoup(html, self.html_parser)
+        converter = self.markdownify.MarkdownConverter(
+            heading_style="ATX",
+            bullets="-",
+            strip=_STRIP_TAGS if include_links else _STRIP_TAGS_NO_LINKS,
+        )
+        return converter.convert_soup(soup)
+
     def _extract_basic(self, html: str, include_links: bool) -> tuple[str, dict]:
-        """Basic extraction using BeautifulSoup"""
+        """Basic extraction using lxml, or BeautifulSoup without it"""
         try:
-            soup = self.BeautifulSoup(html, "html.parser")
-
-            # Extract metadata
-            metadata = {"title": "", "author": "", "date": ""}
-
-            title_tag = soup.find("title")
-            if title_tag:
-                metadata["title"] = title_tag.get_text().strip()
-
-            # Look for author in meta tags
-            author_tag = soup.find("meta", attrs={"name": "author"})
-            if author_tag:
-                metadata["author"] = author_tag.get("content", "")
-
-            # Remove unwanted elements
-            for element in soup(
-                [
-                    "script",
-                    "style",
-                    "nav",
-                    "footer",
-                    "header",
-                    "aside",
-                    "noscript",
-                    "iframe",
-                ]
-            ):
-                element.decompose()
-
-            # Find main content
-            main_content = (
-                soup.find("main")
-                or soup.find("article")
-                or soup.find(
-                    "div", class_=re.compile(r"content|main|article|post", re.I)
-                )
-                or soup.find("body")
-            )
-
-            if main_content:
-                markdown = self.markdownify.markdownify(
-                    str(main_content),
-                    heading_style="ATX",
-                    bullets="-",
-                    strip=["script", "style"],
-                )
+            if self.lxml_html:
+                try:
+                    metadata, main_html = self._select_main_lxml(html)
+                except (ValueError, self.lxml_html.etree.ParserError):
+                    # e.g. str input with an XML encoding declaration, or an
+                    # empty document
+                    metadata, main_html = self._select_main_soup(html)
+            else:
+                metadata, main_html = self._select_main_soup(html)
 
-                if not include_links:
-                    markdown = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", markdown)
+            if main_html:
+                markdown = self._to_markdown(main_html, include_links)
 
                 # Clean up excessive newlines
-                markdown = re.sub(r"\n{3,}", "\n\n", markdown)
+                markdown = _BLANK_LINES_RE.sub("\n\n", markdown)
 
                 return markdown.strip(), metadata
             else:
@@ -463,3 +667,56 @@ class Tools:
 
         except Exception as e:
             return f"Error during extraction: {str(e)}", {}
+
+    def _select_main_lxml(self, html: str) -> tuple[dict, Optional[str]]:
+        """Metadata and main content HTML, straight from an lxml tree"""
+        tree = self.lxml_html.document_fromstring(html)
+
+        metadata = {
+            "title": (tree.findtext(".//title") or "").strip(),
+            # str() so the smart string doesn't keep the whole tree alive
+            "author": str(tree.xpath('string(//meta[@name="author"]/@content)')),
+            "date": "",
+        }
+
+        # Remove unwanted elements, keeping the text that follows them
+        for element in tree.xpath(_BOILERPLATE_XPATH):
+            element.drop_tree()
+
+        for query in _MAIN_CONTENT_XPATHS:
+            found = tree.xpath(query, namespaces=_XPATH_NAMESPACES)
+            if found:
+                main_html = self.lxml_html.tostring(
+                    found[0], encoding="unicode", with_tail=False
+                )
+                return metadata, main_html
+        return metadata, None
+
+    def _select_main_soup(self, html: str) -> tuple[dict, Optional[str]]:
+        """Metadata and main content HTML, using BeautifulSoup"""
+        soup = self.BeautifulSoup(html, self.html_parser)
+
+        # Extract metadata
+        metadata = {"title": "", "author": "", "date": ""}
+
+        title_tag = soup.find("title")
+        if title_tag:
+            metadata["title"] = title_tag.get_text().strip()
+
+        # Look for author in meta tags
+        author_tag = soup.find("meta", attrs={"name": "author"})
+        if author_tag:
+            metadata["author"] = author_tag.get("content", "")
+
+        # Remove unwanted elements
+        for element in soup(list(_BOILERPLATE_TAGS)):
+            element.decompose()
+
+        # Find main content
+        main_content = (
+            soup.find("main")
+            or soup.find("article")
+            or soup.find("div", class_=_CONTENT_CLASS_RE)
+            or soup.find("body")
+        )
+        return metadata, str(main_content) if main_content else None